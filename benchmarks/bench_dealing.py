@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Compare the old rejection-sampling hand generator with the precomputed
+playable-combo table in rtp_drillz_engine.py.
+
+Usage:
+  python3 benchmarks/bench_dealing.py --hands 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rtp_drillz_engine import PLAYABLE_COMBOS, is_playable_combo  # noqa: E402
+from rtp_drillz_deck import CARD_CODES, CARD_INDEX  # noqa: E402
+
+
+def rejection_hand(deck):
+    # Mirrors the pre-table generator: draw two cards, retry until playable.
+    while True:
+        c1, c2 = random.sample(deck, 2)
+        if is_playable_combo(CARD_INDEX[c1], CARD_INDEX[c2]):
+            return sorted([c1, c2], key=lambda c: CARD_INDEX[c], reverse=True)
+
+
+def table_hand():
+    c1, c2 = random.choice(PLAYABLE_COMBOS)
+    return [CARD_CODES[c1], CARD_CODES[c2]]
+
+
+def run(label, fn, hands):
+    start = time.perf_counter()
+    for _ in range(hands):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {hands:>10,} hands  {elapsed:8.3f} s  {hands / elapsed:>12,.0f} hands/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark playable hand generation.")
+    parser.add_argument("--hands", type=int, default=1_000_000, help="Hands to generate per method.")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed.")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    deck = list(CARD_CODES)
+
+    old = run("rejection", lambda: rejection_hand(deck), args.hands)
+    new = run("combo table", table_hand, args.hands)
+    print(f"Speedup: {old / new:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
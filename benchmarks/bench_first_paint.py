@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Compare first paint of the embedded web app built as a per-card data URI
+map against the sprite-atlas build (build_embedded_rtp_drillz.py --atlas).
+
+Builds both variants from --cards-dir into a temp folder, loads each one
+--runs times in headless Chromium and reports HTML size, first-contentful-
+paint (from window.__RTP_PAINT_TIMING__) and the time until every card
+image on the start screen has decoded.
+
+Requires Pillow and Playwright (pip install playwright && playwright install chromium).
+
+Usage:
+  python3 benchmarks/bench_first_paint.py --cards-dir ./PNG-cards-1.3 --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Resolves once every <img> and atlas sheet in the document has decoded.
+DECODED_JS = """
+async () => {
+  const images = Array.from(document.images).map((img) => img.decode().catch(() => null));
+  const atlas = window.__RTP_EMBEDDED_ATLAS__;
+  if (atlas) {
+    const sheet = new Image();
+    sheet.src = atlas.src;
+    images.push(sheet.decode().catch(() => null));
+  }
+  await Promise.all(images);
+  return performance.now();
+}
+"""
+
+
+def build(cards_dir, output, extra):
+    cmd = [
+        sys.executable,
+        str(ROOT / "build_embedded_rtp_drillz.py"),
+        "--cards-dir",
+        str(cards_dir),
+        "--template",
+        str(ROOT / "rtp_drillz_web.html"),
+        "--output",
+        str(output),
+        "--no-cache",
+        *extra,
+    ]
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+
+
+def measure(browser, path, runs):
+    fcp, decoded = [], []
+    for _ in range(runs):
+        page = browser.new_page()
+        page.goto(path.as_uri(), wait_until="load")
+        timing = page.evaluate("() => window.__RTP_PAINT_TIMING__ || {}")
+        fcp.append(timing.get("first-contentful-paint", float("nan")))
+        decoded.append(page.evaluate(DECODED_JS))
+        page.close()
+    return statistics.median(fcp), statistics.median(decoded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure first paint for map vs atlas embedded builds.")
+    parser.add_argument("--cards-dir", required=True, help="Directory containing the PNG card deck.")
+    parser.add_argument("--runs", type=int, default=10, help="Page loads per variant (median is reported).")
+    parser.add_argument("--format", choices=("png", "webp"), default="webp", help="Atlas image format.")
+    args = parser.parse_args()
+
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        print("ERROR: Playwright is required (pip install playwright && playwright install chromium).", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        variants = {
+            "map": (Path(tmp) / "map.html", []),
+            "atlas": (Path(tmp) / "atlas.html", ["--atlas", "--format", args.format]),
+        }
+        for path, extra in variants.values():
+            build(Path(args.cards_dir).expanduser().resolve(), path, extra)
+
+        with sync_playwright() as p:
+            browser = p.chromium.launch()
+            print(f"{'mode':<8} {'html':>10} {'fcp ms':>10} {'decoded ms':>12}")
+            for label, (path, _) in variants.items():
+                fcp, decoded = measure(browser, path, args.runs)
+                size_kb = os.path.getsize(path) / 1024
+                print(f"{label:<8} {size_kb:>8,.0f}KB {fcp:>10.1f} {decoded:>12.1f}")
+            browser.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Loopback load test for the RTP Drillz group server (rtp_drillz_server.py).
+
+Starts the server in this process on 127.0.0.1 (on its own thread and
+event loop), connects --clients WebSocket players plus one coach, and has
+the coach run --rounds drills (deal, keep hand, keep flop, keep turn, keep
+river). For every action it records how long each player takes to receive
+the matching state, and reports p50/p95/max per action type and pool misses
+(deals that had to wait for the refill worker).
+
+Point it at a running server instead with --url and --token.
+
+Exits 1 when a broadcast is lost, when an action's p95 is over
+--max-p95-ms, or when the pool missed more than --max-misses times (local
+server only).
+
+Usage:
+  python3 benchmarks/bench_server.py --clients 200 --rounds 50
+  python3 benchmarks/bench_server.py --clients 50 --rounds 5 --max-p95-ms 250 --max-misses 0
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from rtp_drillz_server import (  # noqa: E402
+    OP_CLOSE,
+    OP_PING,
+    OP_PONG,
+    OP_TEXT,
+    DrillRoom,
+    SpotPool,
+    encode_frame,
+    read_frame,
+    serve,
+)
+
+DRILL_ACTIONS = ("deal", "keep_hand", "keep_flop", "keep_turn", "keep_river")
+
+
+def start_local_server(timer):
+    """Run a server on a background thread; return (port, room)."""
+    room_box, port_box, started = [], [], threading.Event()
+
+    def run():
+        async def main():
+            room = DrillRoom(SpotPool(), timer_seconds=timer)
+            room_box.append(room)
+            ready = asyncio.get_running_loop().create_future()
+            task = asyncio.ensure_future(serve("127.0.0.1", 0, room, ready))
+            port_box.append(await ready)
+            started.set()
+            await task
+
+        asyncio.run(main())
+
+    threading.Thread(target=run, name="rtp-bench-server", daemon=True).start()
+    if not started.wait(30):
+        raise RuntimeError("server did not start")
+    return port_box[0], room_box[0]
+
+
+async def ws_connect(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode("latin-1")
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    if not head.startswith(b"HTTP/1.1 101"):
+        raise RuntimeError(f"WebSocket upgrade failed: {head.splitlines()[0]!r}")
+    return reader, writer
+
+
+class Player:
+    def __init__(self):
+        self.arrivals = {}     # seq -> perf_counter() when received
+        self.seen = asyncio.Event()
+
+    async def run(self, reader, writer):
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == OP_CLOSE:
+                    return
+                if opcode == OP_PING:
+                    writer.write(encode_frame(payload, OP_PONG, mask=True))
+                elif opcode == OP_TEXT:
+                    message = json.loads(payload)
+                    if message.get("type") == "state":
+                        self.arrivals[message["seq"]] = time.perf_counter()
+                        self.seen.set()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def load_test(host, port, token, clients, rounds, timeout):
+    players, tasks, writers = [], [], []
+    for _ in range(clients):
+        reader, writer = await ws_connect(host, port, "/ws")
+        player = Player()
+        players.append(player)
+        writers.append(writer)
+        tasks.append(asyncio.ensure_future(player.run(reader, writer)))
+
+    coach_reader, coach_writer = await ws_connect(host, port, f"/ws?token={token}")
+    opcode, payload = await read_frame(coach_reader)
+    hello = json.loads(payload)
+    if not hello.get("coach"):
+        raise RuntimeError("coach token rejected")
+    seq = hello["seq"]
+
+    latencies = {action: [] for action in DRILL_ACTIONS}
+    lost = 0
+    for _ in range(rounds):
+        for action in DRILL_ACTIONS:
+            seq += 1
+            sent = time.perf_counter()
+            coach_writer.write(encode_frame(json.dumps({"action": action}), mask=True))
+            deadline = sent + timeout
+            for player in players:
+                while seq not in player.arrivals and time.perf_counter() < deadline:
+                    player.seen.clear()
+                    try:
+                        await asyncio.wait_for(player.seen.wait(), deadline - time.perf_counter())
+                    except asyncio.TimeoutError:
+                        break
+                arrived = player.arrivals.pop(seq, None)
+                if arrived is None:
+                    lost += 1
+                else:
+                    latencies[action].append((arrived - sent) * 1000)
+
+    for writer in writers + [coach_writer]:
+        writer.write(encode_frame(b"\x03\xe8", OP_CLOSE, mask=True))
+        writer.close()
+    for task in tasks:
+        task.cancel()
+    return latencies, lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the RTP Drillz group server over loopback.")
+    parser.add_argument("--clients", type=int, default=100, help="Connected players.")
+    parser.add_argument("--rounds", type=int, default=20, help="Drills the coach runs (5 actions each).")
+    parser.add_argument("--timer", type=int, default=30, help="Street timer on the local server.")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Seconds to wait for each broadcast.")
+    parser.add_argument("--url", help="Test a running server, e.g. http://127.0.0.1:8765 (needs --token).")
+    parser.add_argument("--token", help="Coach token of the --url server.")
+    parser.add_argument("--max-p95-ms", type=float, help="Exit 1 if any action's p95 latency is above this.")
+    parser.add_argument("--max-misses", type=int, help="Exit 1 if the spot pool missed more often than this.")
+    args = parser.parse_args()
+
+    room = None
+    if args.url:
+        if not args.token:
+            print("ERROR: --url needs --token", file=sys.stderr)
+            return 1
+        if args.max_misses is not None:
+            print("ERROR: --max-misses needs the local server (pool misses are not visible over --url)", file=sys.stderr)
+            return 1
+        url = urlsplit(args.url)
+        host, port, token = url.hostname, url.port or 80, args.token
+    else:
+        port, room = start_local_server(args.timer)
+        host, token = "127.0.0.1", room.coach_token
+
+    start = time.perf_counter()
+    latencies, lost = asyncio.run(load_test(host, port, token, args.clients, args.rounds, args.timeout))
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.clients} clients, {args.rounds} drills in {elapsed:.2f}s")
+    print(f"{'action':<11} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    slow = []
+    for action, values in latencies.items():
+        if values:
+            p95 = percentile(values, 0.95)
+            over = args.max_p95_ms is not None and p95 > args.max_p95_ms
+            if over:
+                slow.append(action)
+            print(
+                f"{action:<11} {statistics.median(values):>8.2f} {p95:>8.2f} {max(values):>8.2f}"
+                f"{'  OVER BUDGET' if over else ''}"
+            )
+    if room is not None:
+        print(f"pool misses: {room.pool.misses}, dropped clients: {room.dropped}")
+
+    failed = False
+    if lost:
+        print(f"ERROR: {lost} broadcasts not received within {args.timeout}s", file=sys.stderr)
+        failed = True
+    if slow:
+        print(f"ERROR: p95 over {args.max_p95_ms:g} ms for {', '.join(slow)}", file=sys.stderr)
+        failed = True
+    if args.max_misses is not None and room.pool.misses > args.max_misses:
+        print(f"ERROR: {room.pool.misses} pool misses (max {args.max_misses})", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
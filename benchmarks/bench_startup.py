@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Startup budget check for the RTP Drillz desktop app.
+
+Launches `rtp_drillz.py --quit-when-ready` --runs times and reads its
+startup line (time to first frame and time to interactive, both measured
+from the app's first import). Reports the median of each, plus the wall
+time from process launch to exit.
+
+The app runs from a temporary copy (its modules, plus links to the deck
+folders), so the settings file, history database and thumbnail cache it
+creates never land in the checkout. The first launch builds the copy's
+thumbnail cache; later launches are warm starts.
+
+--check exits 1 when Pillow or NumPy were imported before the first frame
+(they must load after it). Medians over budget are reported but only fail
+with --enforce-budgets, since shared CI machines are too noisy for
+millisecond budgets. Needs a display; in CI it runs under xvfb-run.
+
+Usage:
+  python3 benchmarks/bench_startup.py --check
+  python3 benchmarks/bench_startup.py --check --enforce-budgets
+"""
+
+import argparse
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Folders of the checkout that are not linked into the temporary copy.
+SKIP_DIRS = {".git", "__pycache__", "benchmarks", "rtp_thumb_cache"}
+
+FIRST_FRAME_BUDGET_MS = 400
+INTERACTIVE_BUDGET_MS = 3000
+
+STARTUP_LINE = re.compile(
+    r"^Startup: first frame (?P<first>\d+) ms, interactive (?P<ready>\d+) ms"
+    r"(?:, loaded before first frame: (?P<early>.+))?$",
+    re.MULTILINE,
+)
+
+
+def make_app_copy(dest):
+    """Copy the app modules into `dest` and link the deck folders next to them."""
+    for entry in ROOT.iterdir():
+        if entry.is_file() and entry.suffix == ".py":
+            shutil.copy2(entry, dest / entry.name)
+        elif entry.is_dir() and entry.name not in SKIP_DIRS and not entry.name.startswith("."):
+            (dest / entry.name).symlink_to(entry, target_is_directory=True)
+
+
+def launch(app_dir, timeout):
+    """(first_frame_ms, interactive_ms, early_modules, wall_ms) for one launch."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, str(app_dir / "rtp_drillz.py"), "--quit-when-ready"],
+        cwd=str(app_dir),
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    match = STARTUP_LINE.search(proc.stdout)
+    if proc.returncode != 0 or match is None:
+        raise RuntimeError(f"rtp_drillz.py exited {proc.returncode} without a startup line:\n{proc.stderr}")
+    early = tuple(m.strip() for m in match["early"].split(",")) if match["early"] else ()
+    return float(match["first"]), float(match["ready"]), early, wall_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure RTP Drillz desktop startup against a budget.")
+    parser.add_argument("--runs", type=int, default=5, help="Launches (medians are reported).")
+    parser.add_argument("--first-frame-budget", type=float, default=FIRST_FRAME_BUDGET_MS, help="Max median ms.")
+    parser.add_argument("--interactive-budget", type=float, default=INTERACTIVE_BUDGET_MS, help="Max median ms.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds before a launch is abandoned.")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if Pillow or NumPy load before the first frame.")
+    parser.add_argument("--enforce-budgets", action="store_true", help="With --check, also exit 1 on a median over budget.")
+    args = parser.parse_args()
+
+    first, ready, wall, early = [], [], [], set()
+    with tempfile.TemporaryDirectory(prefix="rtp_startup_") as tmp:
+        app_dir = Path(tmp)
+        make_app_copy(app_dir)
+        for _ in range(args.runs):
+            f, r, e, w = launch(app_dir, args.timeout)
+            first.append(f)
+            ready.append(r)
+            wall.append(w)
+            early.update(e)
+
+    rows = (
+        ("first_frame_ms", statistics.median(first), args.first_frame_budget),
+        ("interactive_ms", statistics.median(ready), args.interactive_budget),
+        ("wall_to_exit_ms", statistics.median(wall), None),
+    )
+    failed = []
+    print(f"{'metric':<16} {'median':>10} {'budget':>10}")
+    for name, value, budget in rows:
+        over = budget is not None and value > budget
+        if over and args.enforce_budgets:
+            failed.append(name)
+        budget_text = "-" if budget is None else f"{budget:.0f}"
+        print(f"{name:<16} {value:>10.0f} {budget_text:>10}{'  OVER BUDGET' if over else ''}")
+    if early:
+        failed.append("deferred imports")
+        print(f"Imported before first frame: {', '.join(sorted(early))}")
+
+    if args.check and failed:
+        print(f"ERROR: startup check failed: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite with stored baselines for RTP Drillz.
+
+Cases:
+  reference_ms      fixed pure-Python workload, ms per run (the yardstick)
+  deal_hand         DrillEngine.generate_playable_hand(), us per hand
+  reset_deck        DrillEngine.reset_deck() for a river reroll, us per reset
+  card_index        build_card_file_index() over a synthetic deck tree, ms per scan
+  card_manifest     load_card_manifest() on an unchanged tree, ms per load
+  resize_cold       load_resized() with an empty cache, ms per card (Pillow)
+  resize_warm       load_resized() from the cache, ms per card (Pillow)
+  build_ms          build_embedded_rtp_drillz.main() wall time, ms
+  build_peak_mb     build_embedded_rtp_drillz.main() peak traced memory, MB
+
+Every metric is lower-is-better. Each timing is the best of --repeat runs,
+and the suite runs --runs times (default 3); each metric reports the
+median over those suite runs, so one noisy run cannot fail the check.
+Timings are compared as multiples of reference_ms from the same run, so a
+slower or busier machine scales both sides and the ratio stays put;
+benchmarks/baselines.json stores those multiples (and peak memory in MB).
+--check exits 1 when a relative timing exceeds its baseline by more than
+--fail-threshold (default 4.0) or peak memory by more than
+--memory-threshold. Timings between --threshold (default 2.0) and
+--fail-threshold only print a warning: even normalized, timings on shared
+CI machines swing up to ~1.6x, so only clear slowdowns fail the build.
+--update rewrites the baselines from this run.
+
+Usage:
+  python3 benchmarks/bench_suite.py --check
+  python3 benchmarks/bench_suite.py --update
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import build_embedded_rtp_drillz  # noqa: E402
+from rtp_drillz_assets import PIL_AVAILABLE, build_card_file_index, load_card_manifest, load_resized  # noqa: E402
+from rtp_drillz_deck import CARD_CODES  # noqa: E402
+from rtp_drillz_engine import DrillEngine  # noqa: E402
+
+if PIL_AVAILABLE:
+    from PIL import Image
+
+DEFAULT_BASELINES = Path(__file__).resolve().parent / "baselines.json"
+REFERENCE_METRIC = "reference_ms"
+MEMORY_METRICS = ("build_peak_mb",)
+
+CARD_SIZE = (500, 726)
+DECK_COPIES = 4
+NOISE_DIRS = 20
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_reference(repeat):
+    # Dict, list and int work in the interpreter, like the engine cases.
+    values = [random.Random(0).randrange(1 << 30) for _ in range(50_000)]
+
+    def run():
+        counts = {}
+        for v in values:
+            counts[v & 1023] = counts.get(v & 1023, 0) + 1
+        sorted(values)
+        sum(v % 7 for v in values)
+
+    # The yardstick must be steadier than the cases it scales.
+    return best_of(run, max(repeat, 3) * 4) * 1e3
+
+
+def bench_deal_hand(repeat):
+    engine = DrillEngine(rng=random.Random(1))
+    n = 100_000
+
+    def run():
+        for _ in range(n):
+            engine.generate_playable_hand()
+
+    return best_of(run, repeat) / n * 1e6
+
+
+def bench_reset_deck(repeat):
+    engine = DrillEngine(rng=random.Random(1))
+    engine.deal_hand()
+    engine.keep_hand()
+    engine.keep_flop()
+    engine.keep_turn()
+    excluded = engine.hand + engine.board[:4]
+    n = 50_000
+
+    def run():
+        for _ in range(n):
+            engine.reset_deck(excluded=excluded)
+            engine.deal_card()
+
+    return best_of(run, repeat) / n * 1e6
+
+
+def make_card_png(path, code):
+    if PIL_AVAILABLE:
+        # Content varies per card so encoders cannot shortcut identical files.
+        seed = sum(map(ord, code))
+        im = Image.new("RGB", CARD_SIZE, (seed % 256, seed * 7 % 256, seed * 13 % 256))
+        im.paste((255, 255, 255), (20, 20, CARD_SIZE[0] - 20, CARD_SIZE[1] - 20))
+        im.save(path, format="PNG")
+    else:
+        path.write_bytes(b"\x89PNG\r\n\x1a\n")
+
+
+def make_deck_tree(base):
+    """Several deck folders plus unrelated folders and files beside the app."""
+    for copy in range(DECK_COPIES):
+        deck = base / f"cards_{copy}" / "png"
+        deck.mkdir(parents=True)
+        for code in CARD_CODES:
+            (deck / f"{code.lower()}.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+        (deck / "back.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+    for i in range(NOISE_DIRS):
+        noise = base / f"notes_{i}"
+        noise.mkdir()
+        for j in range(20):
+            (noise / f"file_{j}.txt").write_text("x")
+    (base / "rtp_settings.json").write_text("{}")
+
+
+def bench_card_index(repeat, tmp):
+    base = tmp / "index_tree"
+    base.mkdir()
+    make_deck_tree(base)
+    manifest = tmp / "index_cache" / "card_manifest.json"
+    n = 20
+
+    def scan():
+        for _ in range(n):
+            build_card_file_index(str(base))
+
+    def manifest_load():
+        for _ in range(n):
+            load_card_manifest(str(base), str(manifest))
+
+    load_card_manifest(str(base), str(manifest))
+    return best_of(scan, repeat) / n * 1e3, best_of(manifest_load, repeat) / n * 1e3
+
+
+def bench_resize(repeat, tmp):
+    deck = tmp / "resize_deck"
+    deck.mkdir()
+    paths = []
+    for code in CARD_CODES[:13]:
+        path = deck / f"{code}.png"
+        make_card_png(path, code)
+        paths.append(str(path))
+
+    cold = float("inf")
+    for attempt in range(repeat):
+        cache_dir = str(tmp / f"resize_cache_{attempt}")
+        start = time.perf_counter()
+        for path in paths:
+            load_resized(path, 140, cache_dir)
+        cold = min(cold, time.perf_counter() - start)
+
+    def warm():
+        for path in paths:
+            load_resized(path, 140, cache_dir)
+
+    return cold / len(paths) * 1e3, best_of(warm, repeat) / len(paths) * 1e3
+
+
+def bench_build(repeat, tmp):
+    cards = tmp / "build_cards"
+    cards.mkdir()
+    for code in CARD_CODES:
+        make_card_png(cards / f"{code}.png", code)
+    make_card_png(cards / "back.png", "back")
+
+    wall = float("inf")
+    peak = 0
+    for attempt in range(repeat):
+        argv = [
+            "build_embedded_rtp_drillz.py",
+            "--cards-dir",
+            str(cards),
+            "--template",
+            str(ROOT / "rtp_drillz_web.html"),
+            "--output",
+            str(tmp / f"build_{attempt}.html"),
+            "--no-cache",
+            "--workers",
+            "1",
+        ]
+        saved_argv = sys.argv
+        sys.argv = argv
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                code = build_embedded_rtp_drillz.main()
+        finally:
+            elapsed = time.perf_counter() - start
+            _, attempt_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            sys.argv = saved_argv
+        if code != 0:
+            raise RuntimeError(f"build_embedded_rtp_drillz.main() exited {code}")
+        wall = min(wall, elapsed)
+        peak = max(peak, attempt_peak)
+    return wall * 1e3, peak / (1024 * 1024)
+
+
+def run_suite(repeat):
+    results = {
+        REFERENCE_METRIC: bench_reference(repeat),
+        "deal_hand": bench_deal_hand(repeat),
+        "reset_deck": bench_reset_deck(repeat),
+    }
+    with tempfile.TemporaryDirectory() as td:
+        tmp = Path(td)
+        results["card_index"], results["card_manifest"] = bench_card_index(repeat, tmp)
+        if PIL_AVAILABLE:
+            results["resize_cold"], results["resize_warm"] = bench_resize(repeat, tmp)
+        results["build_ms"], results["build_peak_mb"] = bench_build(repeat, tmp)
+    # Measured again at the end: a machine that slowed down mid-run still gets its best.
+    results[REFERENCE_METRIC] = min(results[REFERENCE_METRIC], bench_reference(repeat))
+    return results
+
+
+def median_results(runs):
+    """Per-metric medians of raw values and of relative values over suite runs."""
+    raw = {name: statistics.median(r[name] for r in runs) for name in runs[0]}
+    rel = [relative(r) for r in runs]
+    return raw, {name: statistics.median(r[name] for r in rel) for name in rel[0]}
+
+
+def relative(results):
+    """Timings as multiples of this run's reference_ms; memory unchanged."""
+    scale = results[REFERENCE_METRIC]
+    return {
+        name: value if name in MEMORY_METRICS else value / scale
+        for name, value in results.items()
+        if name != REFERENCE_METRIC
+    }
+
+
+def compare(results, rel_results, baselines, threshold, fail_threshold, memory_threshold):
+    """Print a results table; return (failed, warned) metric names."""
+    failed, warned = [], []
+    print(f"{REFERENCE_METRIC}: {results[REFERENCE_METRIC]:.3f} (timings below are relative to it)")
+    print(f"{'metric':<16} {'value':>12} {'relative':>12} {'baseline':>12} {'ratio':>8}")
+    for name, rel in rel_results.items():
+        value = results[name]
+        base = baselines.get(name)
+        if base is None:
+            print(f"{name:<16} {value:>12.3f} {rel:>12.4f} {'-':>12} {'-':>8}")
+            continue
+        ratio = rel / base if base else float("inf")
+        flag = ""
+        if ratio > (memory_threshold if name in MEMORY_METRICS else fail_threshold):
+            failed.append(name)
+            flag = "  REGRESSION"
+        elif name not in MEMORY_METRICS and ratio > threshold:
+            warned.append(name)
+            flag = "  SLOWER"
+        print(f"{name:<16} {value:>12.3f} {rel:>12.4f} {base:>12.4f} {ratio:>7.2f}x{flag}")
+    return failed, warned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the RTP Drillz benchmark suite.")
+    parser.add_argument("--baselines", default=str(DEFAULT_BASELINES), help="Baseline JSON path.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is kept).")
+    parser.add_argument("--runs", type=int, default=3, help="Suite runs (the median of each metric is used).")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any metric regresses past its fail threshold.")
+    parser.add_argument("--update", action="store_true", help="Write this run's results as the new baselines.")
+    parser.add_argument("--threshold", type=float, default=2.0, help="Relative/baseline ratio that warns for timings.")
+    parser.add_argument("--fail-threshold", type=float, default=4.0, help="Relative/baseline ratio that fails timings.")
+    parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=1.5,
+        help="Max value/baseline ratio for memory metrics.",
+    )
+    args = parser.parse_args()
+
+    if not PIL_AVAILABLE:
+        print("WARNING: Pillow not installed; skipping resize cases.", file=sys.stderr)
+
+    results, rel_results = median_results([run_suite(args.repeat) for _ in range(max(1, args.runs))])
+
+    try:
+        with open(args.baselines, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+    except (OSError, ValueError):
+        baselines = {}
+
+    failed, warned = compare(results, rel_results, baselines, args.threshold, args.fail_threshold, args.memory_threshold)
+
+    if args.update:
+        with open(args.baselines, "w", encoding="utf-8") as f:
+            json.dump({k: round(v, 6) for k, v in rel_results.items()}, f, indent=2)
+            f.write("\n")
+        print(f"Baselines written: {args.baselines}")
+        return 0
+
+    if warned:
+        print(
+            f"WARNING: {', '.join(warned)} over {args.threshold:g}x baseline"
+            f" (fails at {args.fail_threshold:g}x)",
+            file=sys.stderr,
+        )
+    if args.check and failed:
+        print(f"ERROR: performance regression in {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
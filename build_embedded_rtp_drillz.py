@@ -7,15 +7,45 @@ Usage:
     --cards-dir "/Users/michaelj.bruzzese/Downloads/PNG-cards-1.3" \
     --template "/Users/michaelj.bruzzese/rtp_drillz_web.html" \
     --output "/Users/michaelj.bruzzese/rtp_drillz_web_embedded.html"
+
+Encoded data URIs are cached by file content hash (see --cache-dir), so
+rebuilding after a template-only change skips re-encoding the deck.
+
+--optimize (requires Pillow) resizes every card to the web app's display
+height and recompresses it as optimized PNG or WebP before embedding:
+  python3 build_embedded_rtp_drillz.py ... --optimize --format webp --budget-kb 1500
+
+--atlas (requires Pillow) packs all 52 faces and the back into one sprite
+image plus a coordinate table (window.__RTP_EMBEDDED_ATLAS__), so the
+browser decodes a single image instead of 53:
+  python3 build_embedded_rtp_drillz.py ... --atlas --format webp
+
+--deferred moves each card's data URI into its own non-executed
+<script type="application/octet-stream"> chunk after the app script, so the
+start screen renders before the card payloads are parsed; the template
+reads a chunk the first time that card is shown.
 """
 
 import argparse
 import base64
+import hashlib
+import io
 import json
 import os
 import re
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Callable
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
 
 
 RANK_WORD_TO_SHORT = {
@@ -48,6 +78,15 @@ CARD_NAME_PATTERN = re.compile(
 CARD_SHORT_PATTERN = re.compile(r"^([a2-9tjqk])([shdc])\.png$", re.IGNORECASE)
 
 ALL_KEYS = [f"{r}{s}" for r in "A23456789TJQK" for s in "shdc"]
+ATLAS_RANKS = "A23456789TJQK"
+ATLAS_SUITS = "shdc"
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "rtp_drillz" / "build"
+CACHE_VERSION = 1
+
+# .card is 145 CSS px tall in rtp_drillz_web.html; 2x covers high-DPI phones.
+DEFAULT_OPTIMIZED_HEIGHT = 290
+WEBP_MIN_QUALITY = 40
 
 
 def to_data_uri(path: Path) -> str:
@@ -56,6 +95,236 @@ def to_data_uri(path: Path) -> str:
     return f"data:image/png;base64,{b64}"
 
 
+def optimized_data_uri(path: Path, height: int, fmt: str, quality: int, palette: bool) -> str:
+    """Resize to at most `height` px tall and recompress as PNG or WebP."""
+    resample = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
+    with Image.open(path) as im:
+        im = im.convert("RGBA")
+        if im.height > height:
+            width = max(1, round(im.width * height / im.height))
+            im = im.resize((width, height), resample)
+
+        buf = io.BytesIO()
+        if fmt == "webp":
+            im.save(buf, format="WEBP", quality=quality, method=6)
+        else:
+            if palette:
+                im = im.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+            im.save(buf, format="PNG", optimize=True)
+
+    b64 = base64.b64encode(buf.getvalue()).decode("ascii")
+    return f"data:image/{fmt};base64,{b64}"
+
+
+def atlas_cell(key: str) -> tuple[int, int]:
+    """(column, row) of a card in the atlas: one row per suit, the back on row 4."""
+    if key == "back":
+        return 0, len(ATLAS_SUITS)
+    return ATLAS_RANKS.index(key[0]), ATLAS_SUITS.index(key[1])
+
+
+def build_atlas(sources: dict[str, Path], height: int, fmt: str, quality: int) -> dict:
+    """
+    Pack every source into one sprite sheet of `height` px tall cells.
+    Returns {"src": data URI, "width", "height", "cards": {key: [x, y, w, h]}}.
+    """
+    resample = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
+    images: dict[str, Image.Image] = {}
+    for key, path in sources.items():
+        with Image.open(path) as im:
+            im = im.convert("RGBA")
+            width = max(1, round(im.width * height / im.height))
+            images[key] = im.resize((width, height), resample)
+
+    cell_w = max(im.width for im in images.values())
+    rows = len(ATLAS_SUITS) + (1 if "back" in images else 0)
+    sheet = Image.new("RGBA", (cell_w * len(ATLAS_RANKS), height * rows), (0, 0, 0, 0))
+    cards: dict[str, list[int]] = {}
+    for key, im in images.items():
+        col, row = atlas_cell(key)
+        x, y = col * cell_w, row * height
+        sheet.paste(im, (x, y))
+        cards[key] = [x, y, im.width, im.height]
+
+    buf = io.BytesIO()
+    if fmt == "webp":
+        sheet.save(buf, format="WEBP", quality=quality, method=6)
+    else:
+        sheet.save(buf, format="PNG", optimize=True)
+    b64 = base64.b64encode(buf.getvalue()).decode("ascii")
+    return {
+        "src": f"data:image/{fmt};base64,{b64}",
+        "width": sheet.width,
+        "height": sheet.height,
+        "cards": cards,
+    }
+
+
+def data_uri_bytes(uri: str) -> int:
+    b64 = uri.split(",", 1)[1]
+    return len(b64) * 3 // 4 - b64[-2:].count("=")
+
+
+def optimization_attempts(fmt: str, quality: int) -> list[tuple[int, bool]]:
+    """(quality, palette) settings to try in order until the size budget is met."""
+    if fmt == "webp":
+        steps = list(range(quality, WEBP_MIN_QUALITY - 1, -10)) or [quality]
+        return [(q, False) for q in steps]
+    return [(0, False), (0, True)]
+
+
+class BuildCache:
+    """
+    Encoded data URIs stored under the SHA-256 of the source bytes.
+
+    A stat index (path -> size, mtime, digest) lets unchanged files skip
+    even being read. A root of None disables caching.
+    """
+
+    def __init__(self, root: Path | None) -> None:
+        self.root = root
+        self.index: dict[str, dict] = {}
+        self.dirty = False
+        if root is None:
+            return
+        try:
+            data = json.loads((root / "index.json").read_text(encoding="utf-8"))
+            if data.get("version") == CACHE_VERSION:
+                self.index = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    def digest(self, path: Path) -> str:
+        st = path.stat()
+        entry = self.index.get(str(path))
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["sha256"]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.index[str(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        self.dirty = True
+        return digest
+
+    def get(self, digest: str) -> str | None:
+        if self.root is None:
+            return None
+        try:
+            return (self.root / "uris" / f"{digest}.txt").read_text(encoding="ascii")
+        except OSError:
+            return None
+
+    def put(self, digest: str, uri: str) -> None:
+        if self.root is None:
+            return
+        write_atomic(self.root / "uris" / f"{digest}.txt", uri)
+
+    def save(self) -> None:
+        if self.root is None or not self.dirty:
+            return
+        payload = {"version": CACHE_VERSION, "files": self.index}
+        write_atomic(self.root / "index.json", json.dumps(payload, separators=(",", ":")))
+
+
+def write_atomic(path: Path, text: str) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError as exc:
+        print(f"WARNING: could not write cache file {path}: {exc}", file=sys.stderr)
+
+
+def encode_sources(
+    sources: dict[str, Path],
+    cache: BuildCache,
+    workers: int,
+    encoder: Callable[[Path], str] = to_data_uri,
+    variant: str = "",
+) -> tuple[dict[str, str], int, int]:
+    """
+    Return (key -> data URI, cache hits, cache misses); misses encode on a
+    thread pool. `variant` names the encoder settings and is part of the
+    cache key.
+    """
+    uris: dict[str, str] = {}
+    misses: dict[str, list[str]] = {}
+    paths: dict[str, Path] = {}
+    hits = 0
+
+    for key, path in sources.items():
+        digest = cache.digest(path)
+        if variant:
+            digest = f"{digest}-{variant}"
+        uri = cache.get(digest)
+        if uri is not None:
+            uris[key] = uri
+            hits += 1
+        else:
+            misses.setdefault(digest, []).append(key)
+            paths[digest] = path
+
+    if misses:
+        digests = list(misses)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            encoded = list(pool.map(encoder, (paths[d] for d in digests)))
+        for digest, uri in zip(digests, encoded):
+            cache.put(digest, uri)
+            for key in misses[digest]:
+                uris[key] = uri
+
+    cache.save()
+    return uris, hits, sum(len(keys) for keys in misses.values())
+
+
+def encode_atlas(
+    sources: dict[str, Path],
+    cache: BuildCache,
+    height: int,
+    fmt: str,
+    quality: int,
+) -> tuple[dict, bool]:
+    """Return (atlas, cache hit); the cache key covers every source digest and the settings."""
+    h = hashlib.sha256()
+    for key in sorted(sources):
+        h.update(f"{key}:{cache.digest(sources[key])};".encode("ascii"))
+    digest = f"{h.hexdigest()}-atlas-{fmt}-{height}-{quality}"
+
+    cached = cache.get(digest)
+    if cached is not None:
+        try:
+            cache.save()
+            return json.loads(cached), True
+        except ValueError:
+            pass
+
+    atlas = build_atlas(sources, height, fmt, quality)
+    cache.put(digest, json.dumps(atlas, separators=(",", ":")))
+    cache.save()
+    return atlas, False
+
+
+def print_size_report(sources: dict[str, Path], embedded_map: dict[str, str]) -> tuple[int, int]:
+    total_before = total_after = 0
+    print(f"{'card':<6} {'before':>10} {'after':>10} {'saved':>7}")
+    for key, path in sources.items():
+        before = path.stat().st_size
+        after = data_uri_bytes(embedded_map[key])
+        total_before += before
+        total_after += after
+        print(f"{key:<6} {before:>10,} {after:>10,} {saved_pct(before, after):>6.1f}%")
+    print(f"{'total':<6} {total_before:>10,} {total_after:>10,} {saved_pct(total_before, total_after):>6.1f}%")
+    return total_before, total_after
+
+
+def saved_pct(before: int, after: int) -> float:
+    return 100.0 * (before - after) / before if before else 0.0
+
+
 def collect_card_files(cards_dir: Path) -> dict[str, Path]:
     """
     Return best-match card file paths keyed by short code like 'As', 'Td', etc.
@@ -118,9 +387,33 @@ def find_back_image(cards_dir: Path) -> Path | None:
 
 
 def inject_embedded_map(template_html: str, embedded_map: dict[str, str]) -> str:
+    return inject_global(template_html, "__RTP_EMBEDDED_CARDS__", embedded_map)
+
+
+def inject_embedded_atlas(template_html: str, atlas: dict) -> str:
+    return inject_global(template_html, "__RTP_EMBEDDED_ATLAS__", atlas)
+
+
+def inject_deferred_cards(template_html: str, embedded_map: dict[str, str]) -> str:
+    """Inline an empty card map plus one payload chunk per card before </body>."""
+    html = inject_global(template_html, "__RTP_EMBEDDED_CARDS__", {})
+    html = inject_global(html, "__RTP_EMBEDDED_DEFERRED__", True)
+
+    chunks = "".join(
+        f'<script type="application/octet-stream" id="rtp-card-{key}">{uri}</script>\n'
+        for key, uri in embedded_map.items()
+    )
+    needle = "</body>"
+    index = html.rfind(needle)
+    if index < 0:
+        raise ValueError("Could not find </body> in template HTML.")
+    return html[:index] + chunks + html[index:]
+
+
+def inject_global(template_html: str, name: str, value: object) -> str:
     inject_tag = (
         "<script>\n"
-        f"window.__RTP_EMBEDDED_CARDS__ = {json.dumps(embedded_map, separators=(',', ':'))};\n"
+        f"window.{name} = {json.dumps(value, separators=(',', ':'))};\n"
         "</script>\n"
     )
 
@@ -147,7 +440,54 @@ def main() -> int:
         default=str(Path.home() / "rtp_drillz_web_embedded.html"),
         help="Output path for embedded single-file HTML.",
     )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help="Directory for cached encoded card images.",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Re-encode every card without using the cache.")
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Resize cards to display size and recompress before embedding (requires Pillow).",
+    )
+    parser.add_argument(
+        "--card-height",
+        type=int,
+        default=DEFAULT_OPTIMIZED_HEIGHT,
+        help="Card height in pixels for --optimize and --atlas.",
+    )
+    parser.add_argument(
+        "--atlas",
+        action="store_true",
+        help="Pack all cards into one sprite image with a coordinate table (requires Pillow).",
+    )
+    parser.add_argument(
+        "--deferred",
+        action="store_true",
+        help="Emit each card as a separate payload chunk decoded on first use instead of one inline map.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("png", "webp"),
+        default="png",
+        help="Image format for --optimize and --atlas.",
+    )
+    parser.add_argument("--quality", type=int, default=85, help="WebP quality (starting quality for --optimize).")
+    parser.add_argument(
+        "--budget-kb",
+        type=int,
+        default=0,
+        help="Max total embedded image size in KB for --optimize; quality steps down to fit (0 = no budget).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Threads used to encode cache misses.",
+    )
     args = parser.parse_args()
+    started = time.perf_counter()
 
     cards_dir = Path(args.cards_dir).expanduser().resolve()
     template_path = Path(args.template).expanduser().resolve()
@@ -159,6 +499,12 @@ def main() -> int:
     if not template_path.is_file():
         print(f"ERROR: template not found: {template_path}", file=sys.stderr)
         return 1
+    if (args.optimize or args.atlas) and not PIL_AVAILABLE:
+        print("ERROR: --optimize and --atlas require Pillow (pip install pillow).", file=sys.stderr)
+        return 1
+    if args.atlas and (args.optimize or args.deferred):
+        print("ERROR: --atlas cannot be combined with --optimize or --deferred.", file=sys.stderr)
+        return 1
 
     card_files = collect_card_files(cards_dir)
     missing = [k for k in ALL_KEYS if k not in card_files]
@@ -167,23 +513,74 @@ def main() -> int:
         print(f"Missing keys: {', '.join(missing)}", file=sys.stderr)
         return 1
 
-    embedded_map: dict[str, str] = {}
-    for key in ALL_KEYS:
-        embedded_map[key] = to_data_uri(card_files[key])
-
+    sources = {key: card_files[key] for key in ALL_KEYS}
     back = find_back_image(cards_dir)
     if back is not None:
-        embedded_map["back"] = to_data_uri(back)
+        sources["back"] = back
+
+    cache = BuildCache(None if args.no_cache else Path(args.cache_dir).expanduser().resolve())
+    encode_started = time.perf_counter()
+    atlas = None
+    if args.atlas:
+        atlas, hit = encode_atlas(sources, cache, args.card_height, args.format, args.quality)
+        hits, misses = (1, 0) if hit else (0, 1)
+        embedded_map = atlas["cards"]
+        print(f"Atlas: {atlas['width']}x{atlas['height']} px, {data_uri_bytes(atlas['src']) / 1024:.0f} KB")
+    elif not args.optimize:
+        embedded_map, hits, misses = encode_sources(sources, cache, args.workers)
+    else:
+        budget = args.budget_kb * 1024
+        hits = misses = 0
+        for quality, palette in optimization_attempts(args.format, args.quality):
+            encoder = partial(
+                optimized_data_uri,
+                height=args.card_height,
+                fmt=args.format,
+                quality=quality,
+                palette=palette,
+            )
+            variant = f"opt-{args.format}-{args.card_height}-{'pal' if palette else quality}"
+            embedded_map, attempt_hits, attempt_misses = encode_sources(
+                sources, cache, args.workers, encoder, variant
+            )
+            hits += attempt_hits
+            misses += attempt_misses
+            total = sum(data_uri_bytes(uri) for uri in embedded_map.values())
+            if not budget or total <= budget:
+                break
+            print(f"Over budget at {variant}: {total / 1024:.0f} KB > {args.budget_kb} KB")
+
+        _, total_after = print_size_report(sources, embedded_map)
+        if budget and total_after > budget:
+            print(
+                f"ERROR: embedded images are {total_after / 1024:.0f} KB, over the {args.budget_kb} KB budget.",
+                file=sys.stderr,
+            )
+            return 1
+    encode_ms = (time.perf_counter() - encode_started) * 1000
 
     template_html = template_path.read_text(encoding="utf-8")
-    output_html = inject_embedded_map(template_html, embedded_map)
-    output_path.write_text(output_html, encoding="utf-8")
+    if atlas is not None:
+        output_html = inject_embedded_atlas(template_html, atlas)
+    elif args.deferred:
+        output_html = inject_deferred_cards(template_html, embedded_map)
+    else:
+        output_html = inject_embedded_map(template_html, embedded_map)
+    try:
+        unchanged = output_path.read_text(encoding="utf-8") == output_html
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        output_path.write_text(output_html, encoding="utf-8")
 
     size_mb = output_path.stat().st_size / (1024 * 1024)
-    print(f"Built: {output_path}")
+    total_ms = (time.perf_counter() - started) * 1000
+    print(f"Built: {output_path}{' (unchanged)' if unchanged else ''}")
     print(f"Embedded cards: {len(embedded_map) - (1 if 'back' in embedded_map else 0)}/52")
     print(f"Back image embedded: {'yes' if 'back' in embedded_map else 'no'}")
     print(f"Output size: {size_mb:.2f} MB")
+    print(f"Cache: {hits} hits, {misses} misses (encode {encode_ms:.1f} ms)")
+    print(f"Total time: {total_ms:.1f} ms")
     return 0
 
 
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Generate large RTP Drillz study packs from the headless drill engine.
+
+Writes the web app's session export format (`version: 1` JSON with a
+`hands` array of hand1/hand2/flop1/flop2/flop3/turn/river fields) or a
+streaming NDJSON variant with one hand object per line.
+
+--board fixes the flop (and optionally turn and river) for every hand; hero
+hands are then drawn from the range around the board's blockers, with any
+range frequencies (e.g. "AKo:0.5") respected.
+
+Hands are generated in fixed-size chunks, each with its own RNG seeded from
+(--seed, chunk index), so the output is identical for any --workers value.
+
+Usage:
+  python3 generate_rtp_drillz_packs.py \
+    --count 1000000 \
+    --seed 42 \
+    --workers 8 \
+    --format ndjson \
+    --output ./study_pack.ndjson
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, TextIO
+
+from rtp_drillz_deck import cards_mask, from_code, to_code
+from rtp_drillz_engine import DrillEngine
+from rtp_drillz_ranges import PLAYABLE_RANGE, POSITIONS, SPOT_RANGES, SPOT_TYPES, compile_range
+from rtp_drillz_review import split_cards
+from rtp_drillz_sampler import ComboSampler
+from rtp_drillz_textures import TEXTURES, matching_flops
+
+
+CHUNK_SIZE = 5000
+HAND_FIELDS = ("hand1", "hand2", "flop1", "flop2", "flop3", "turn", "river")
+
+
+def chunk_rng(seed: int, chunk: int) -> random.Random:
+    # String seeds hash through SHA-512, so streams are stable across runs,
+    # processes and platforms and do not overlap between chunks.
+    return random.Random(f"rtp-drillz:{seed}:{chunk}")
+
+
+def generate_chunk(job: tuple[int, int, int, tuple[str, ...], bool, str, tuple[str, ...]]) -> list[str]:
+    """Return `size` hands for one chunk as serialized JSON objects."""
+    seed, chunk, size, textures, iso_flops, hand_range, board = job
+    engine = DrillEngine(
+        rng=chunk_rng(seed, chunk),
+        flop_textures=textures,
+        iso_flops=iso_flops,
+        hand_range=compile_range(hand_range),
+    )
+    out = []
+    for _ in range(size):
+        if board:
+            engine.deal_hand_on_board(board)
+        else:
+            engine.deal_hand()
+        engine.keep_hand()
+        engine.keep_flop()
+        engine.keep_turn()
+        hand = dict(zip(HAND_FIELDS, engine.hand + engine.board))
+        out.append(json.dumps(hand, separators=(",", ":")))
+    return out
+
+
+def iter_chunks(
+    count: int,
+    seed: int,
+    workers: int,
+    textures: tuple[str, ...] = (),
+    iso_flops: bool = False,
+    hand_range: str = PLAYABLE_RANGE,
+    board: tuple[str, ...] = (),
+) -> Iterator[list[str]]:
+    jobs = [
+        (seed, i, min(CHUNK_SIZE, count - start), textures, iso_flops, hand_range, board)
+        for i, start in enumerate(range(0, count, CHUNK_SIZE))
+    ]
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield generate_chunk(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, keeping output deterministic.
+        yield from pool.map(generate_chunk, jobs)
+
+
+def write_json(out: TextIO, chunks: Iterator[list[str]], count: int, session_name: str) -> None:
+    header = {
+        "version": 1,
+        "session_name": session_name,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        "hand_count": count,
+    }
+    out.write(json.dumps(header, indent=2)[:-2])
+    out.write(',\n  "hands": [')
+    first = True
+    for chunk in chunks:
+        for line in chunk:
+            out.write("\n    " if first else ",\n    ")
+            out.write(line)
+            first = False
+    out.write("\n  ]\n}\n")
+
+
+def write_ndjson(out: TextIO, chunks: Iterator[list[str]]) -> None:
+    for chunk in chunks:
+        out.write("\n".join(chunk))
+        out.write("\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate RTP Drillz study packs.")
+    parser.add_argument("--count", type=int, default=1000, help="Number of hands to generate.")
+    parser.add_argument("--seed", type=int, default=0, help="Base RNG seed.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (output does not depend on this).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("json", "ndjson"),
+        default="json",
+        help="Session JSON (web app import format) or one hand per line.",
+    )
+    parser.add_argument(
+        "--flop-texture",
+        action="append",
+        choices=TEXTURES,
+        default=[],
+        help="Only deal flops with this texture (repeat to require several).",
+    )
+    parser.add_argument(
+        "--iso-flops",
+        action="store_true",
+        help="Deal flops uniformly over suit-isomorphism classes (1,755) instead of raw flops.",
+    )
+    parser.add_argument(
+        "--spot",
+        choices=[f"{t}-{p}" for t in SPOT_TYPES for p in POSITIONS],
+        help="Deal hero hands from the default range for this spot type and position.",
+    )
+    parser.add_argument("--range", help='Hero range in standard notation, e.g. "TT+, AQs+, AKo" (overrides --spot).')
+    parser.add_argument(
+        "--board",
+        help="Fixed flop, flop+turn or full board for every hand, e.g. Qh7c2d (hero avoids these cards).",
+    )
+    parser.add_argument("--session-name", default="RTP Study Pack", help="session_name for JSON output.")
+    parser.add_argument("--output", default="-", help="Output path, or '-' for stdout.")
+    args = parser.parse_args()
+
+    if args.count < 0:
+        print("ERROR: --count must be >= 0", file=sys.stderr)
+        return 1
+
+    hand_range = args.range or (SPOT_RANGES[tuple(args.spot.split("-"))] if args.spot else PLAYABLE_RANGE)
+    try:
+        if not compile_range(hand_range).combos:
+            print("ERROR: --range contains no hands", file=sys.stderr)
+            return 1
+        if args.flop_texture:
+            # Textures that cannot all hold (e.g. monotone + paired) fail here, not in a worker.
+            matching_flops(tuple(args.flop_texture))
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    board = ()
+    if args.board:
+        board = tuple(split_cards(args.board.replace(" ", "")))
+        try:
+            cards = [from_code(c) for c in board]
+        except (KeyError, IndexError):
+            print(f"ERROR: Bad --board: {args.board!r}", file=sys.stderr)
+            return 1
+        if not 3 <= len(cards) <= 5 or len(set(cards)) != len(cards):
+            print("ERROR: --board needs 3 to 5 distinct cards", file=sys.stderr)
+            return 1
+        if args.flop_texture or args.iso_flops:
+            print("ERROR: --board cannot be combined with --flop-texture or --iso-flops", file=sys.stderr)
+            return 1
+        sampler = ComboSampler(compile_range(hand_range))
+        sampler.set_dead(cards_mask(cards))
+        if not sampler.live_count:
+            print("ERROR: every hand in the range is blocked by --board", file=sys.stderr)
+            return 1
+        board = tuple(to_code(c) for c in cards)
+
+    start = time.perf_counter()
+    chunks = iter_chunks(
+        args.count, args.seed, args.workers, tuple(args.flop_texture), args.iso_flops, hand_range, board
+    )
+
+    if args.output == "-":
+        out = sys.stdout
+    else:
+        out = Path(args.output).expanduser().resolve().open("w", encoding="utf-8")
+
+    try:
+        if args.format == "json":
+            write_json(out, chunks, args.count, args.session_name)
+        else:
+            write_ndjson(out, chunks)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Generated {args.count:,} hands in {elapsed:.2f}s ({args.format})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,17 +2,77 @@
 """
 RTP Drillz - Range/Texture/Pressure poker drill tool (Tkinter)
 Texas Hold'em street-by-street drill with optional per-street timer.
+
+  python3 rtp_drillz.py --profile [trace.json]
+
+records spans for button actions, scene rendering, card image loads, deck
+resets and timer callbacks, writes them as a Chrome trace on exit and
+prints p50/p95 per span.
+
+The window is shown before Pillow, NumPy and the card index are loaded;
+those load on a worker after the first frame while cards draw as text.
+Each launch prints its time to first frame and time to interactive.
 """
 
+import time
+
+# Baseline for the startup report, taken before the other imports.
+LAUNCHED = time.perf_counter()
+
+import argparse
+import math
 import os
-import random
+import queue
+import sys
+from collections import OrderedDict, deque
 import tkinter as tk
-
-try:
-    from PIL import Image, ImageTk
+from concurrent.futures import ThreadPoolExecutor
+
+from rtp_drillz_deck import from_code
+from rtp_drillz_engine import STREET_STAGES, DrillEngine
+from rtp_drillz_history import DrillRecord, HistoryStore
+from rtp_drillz_iso import spot_key
+from rtp_drillz_profile import Profiler
+from rtp_drillz_ranges import POSITIONS, SPOT_TYPES, spot_range
+from rtp_drillz_review import ReviewScheduler, split_cards
+from rtp_drillz_settings import DEFAULTS as DEFAULT_SETTINGS, SettingsStore
+
+# Set by load_card_modules() and load_equity_module() after the first frame.
+ImageTk = None
+load_card_manifest = None
+load_resized = None
+hero_equity = None
+PIL_AVAILABLE = False
+EQUITY_AVAILABLE = False
+
+# Modules that must not be imported before the first frame.
+DEFERRED_MODULES = ("PIL", "numpy")
+
+
+def load_card_modules():
+    """Import the card asset helpers and Pillow's ImageTk (if installed)."""
+    global ImageTk, PIL_AVAILABLE, load_card_manifest, load_resized
+    import rtp_drillz_assets
+
+    load_card_manifest = rtp_drillz_assets.load_card_manifest
+    load_resized = rtp_drillz_assets.load_resized
+    try:
+        from PIL import ImageTk as image_tk
+    except ImportError:
+        return
+    ImageTk = image_tk
     PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+
+
+def load_equity_module():
+    """Import the NumPy equity evaluator (if NumPy is installed)."""
+    global EQUITY_AVAILABLE, hero_equity
+    try:
+        from rtp_drillz_equity import hero_equity as equity_fn
+    except ImportError:
+        return
+    hero_equity = equity_fn
+    EQUITY_AVAILABLE = True
 
 
 class RTPDrillzApp(tk.Tk):
@@ -24,9 +84,6 @@ class RTPDrillzApp(tk.Tk):
     ORANGE_HOVER = "#ffad33"
     RED_FLASH = "#ff3300"
 
-    RANKS = "23456789TJQKA"
-    SUITS = "shdc"
-
     TIMER_OPTIONS = ["None", "10s", "15s", "30s", "45s", "60s", "90s"]
     TIMER_MAP = {
         "None": 0,
@@ -38,41 +95,238 @@ class RTPDrillzApp(tk.Tk):
         "90s": 90,
     }
 
-    def __init__(self):
+    FLOP_TEXTURE_OPTIONS = {
+        "Any": (),
+        "Monotone": ("monotone",),
+        "Two-tone": ("two-tone",),
+        "Rainbow": ("rainbow",),
+        "Paired": ("paired",),
+        "Connected": ("connected",),
+        "Two-tone conn.": ("two-tone", "connected"),
+        "A-high dry": ("a-high-dry",),
+        "Broadway": ("broadway",),
+        "Low": ("low",),
+    }
+
+    # Print per-refresh frame time and widget update counts.
+    FRAME_STATS = bool(os.environ.get("RTP_DRILLZ_FRAME_STATS"))
+
+    PRELOAD_WORKERS = 4
+    PRELOAD_POLL_MS = 15
+
+    # Below this many seconds left the countdown shows tenths.
+    TIMER_SUBSECOND_BELOW = 10
+
+    # Trials stop early once the estimate's standard error is under
+    # EQUITY_STDERR; EQUITY_ITERATIONS caps a spot at about 40 ms.
+    EQUITY_ITERATIONS = 12000
+    EQUITY_STDERR = 0.005
+    EQUITY_CACHE_SIZE = 4096
+    EQUITY_POLL_MS = 25
+
+    # Hero range per spot; "Playable" is the wide default drill range.
+    RANGE_OPTIONS = {"Playable": (None, None)}
+    RANGE_OPTIONS.update({f"{t} {p}": (t, p) for t in SPOT_TYPES for p in POSITIONS})
+
+    DEAL_MODES = ["Random", "Review due"]
+    REVIEW_POLL_MS = 50
+
+    # Methods wrapped by --profile, by trace category.
+    PROFILE_SPANS = {
+        "action": (
+            "deal_hand", "keep_hand", "new_flop", "keep_flop", "new_turn",
+            "keep_turn", "new_river", "keep_river", "flag_mistake",
+        ),
+        "render": ("_refresh_scene", "_render_board", "_render_hand"),
+        "image": ("_get_card_image", "_get_back_image", "_load_and_resize", "_preload_image", "_load_card_assets"),
+        "timer": ("_start_timer_for_street", "_tick_timer", "_time_up"),
+        "poll": ("_poll_startup", "_poll_image_preload", "_poll_equity", "_poll_review_load"),
+    }
+    DEFAULT_TRACE_NAME = "rtp_drillz_trace.json"
+
+    STARTUP_POLL_MS = 15
+
+    def __init__(self, profile_path=None, quit_when_ready=False):
         super().__init__()
         self.title("RTP Drillz")
-        self.geometry("1000x800")
         self.minsize(900, 700)
         self.configure(bg=self.DARK_BG)
 
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
-        self.config_path = os.path.join(self.script_dir, "rtp_config.txt")
+        # Settings are saved by a writer thread, debounced, so menu changes
+        # and window drags never wait on the disk.
+        self.settings = SettingsStore(
+            os.path.join(self.script_dir, "rtp_settings.json"),
+            legacy_path=os.path.join(self.script_dir, "rtp_config.txt"),
+        )
+        self._restore_geometry()
+        self.thumb_cache_dir = os.path.join(self.script_dir, "rtp_thumb_cache")
+        self.manifest_path = os.path.join(self.thumb_cache_dir, "card_manifest.json")
+        self.history_path = os.path.join(self.script_dir, "rtp_history.sqlite3")
 
         self.card_height = 140
         self.card_width = 100
 
-        self.hand = []
-        self.board = []
-        self.deck = []
-        self.stage = "start"
-
+        self.engine = DrillEngine()
+
+        # --profile wraps the PROFILE_SPANS methods on this instance (and the
+        # engine's deck reset); without it nothing is wrapped.
+        self.profile_path = profile_path
+        self.profiler = None
+        if profile_path:
+            self.profiler = Profiler()
+            for category, methods in self.PROFILE_SPANS.items():
+                self.profiler.instrument(self, methods, category)
+            self.profiler.instrument(self.engine, ("reset_deck",), "engine")
+
+        # Completed drills are queued to the history store, which writes
+        # them in batches on its own thread. decision_ms holds the time
+        # spent on each street of the current drill.
+        self.history = HistoryStore(self.history_path)
+        self.street_started = None
+        self.decision_ms = {}
+        self.street_timeouts = 0
+        self.last_record = None
+
+        # "Review due" mode deals spots from the history by spaced-repetition
+        # priority. The scheduler is loaded on a worker the first time the
+        # mode is chosen; until then Deal Hand stays random. Drills finished
+        # or flagged while it loads wait in review_backlog and are replayed.
+        self.review = None
+        self.review_executor = None
+        self.review_future = None
+        self.review_poll_job = None
+        self.review_backlog = None
+        self.review_key = None
+
+        # The street timer counts down to a time.monotonic() deadline, so
+        # late after() callbacks never accumulate drift. timer_latencies
+        # records how late each tick fired, in ms.
         self.timer_job = None
-        self.time_left = 0
+        self.timer_deadline = None
+        self.timer_expected = None
+        self.timer_latencies = deque(maxlen=1000)
         self.flash_job = None
 
-        self.card_file_index = self._build_card_file_index()
+        # Equity runs on a worker thread; the Tk thread polls for the result.
+        # The executor is created once the equity module has loaded.
+        self.equity_executor = None
+        self.equity_future = None
+        self.equity_poll_job = None
+        # Flop results keyed by (range, suit-isomorphic spot), least recently
+        # used first; relabeled spots reuse them. Only the worker touches it.
+        self.equity_cache = OrderedDict()
+
+        # Pillow, the card index and NumPy load on startup_executor after the
+        # first frame (see _on_first_map); until then cards are drawn as text.
+        self.startup_pending = True
+        self.startup_executor = None
+        self.startup_cards = None
+        self.startup_equity = None
+        self.startup_job = None
+        self.first_frame_ms = None
+        self.early_modules = ()
+        self.quit_when_ready = quit_when_ready
+
+        self.card_paths = {}
         self.card_image_cache = {}
         self.back_image_cache = None
 
-        self.timer_var = tk.StringVar(value=self._load_timer_choice())
+        # Card faces and back are decoded on worker threads at startup and
+        # handed back through image_queue; PhotoImages are made on the Tk thread.
+        self.image_queue = queue.Queue()
+        self.preload_pending = set()
+        self.preload_missed = False
+        self.preload_started = None
+        self.preload_executor = None
+        self.preload_job = None
+
+        self.timer_var = tk.StringVar(value=self.settings.get("timer"))
         self.countdown_var = tk.StringVar(value="Time left: --:--")
+        self.equity_var = tk.StringVar(value="")
+        self.texture_var = tk.StringVar(value=self.settings.get("flop_texture"))
+        self.deal_mode_var = tk.StringVar(value="Random")
+        self.range_var = tk.StringVar(value=self.settings.get("range"))
 
         self._build_ui()
         self.timer_var.trace_add("write", self._on_timer_choice_change)
+        self.texture_var.trace_add("write", self._on_texture_choice_change)
+        self.deal_mode_var.trace_add("write", self._on_deal_mode_change)
+        self.range_var.trace_add("write", self._on_range_choice_change)
+        # Apply (and validate) the restored choices.
+        self._on_texture_choice_change()
+        self._on_range_choice_change()
+        if self.timer_var.get() not in self.TIMER_OPTIONS:
+            self.timer_var.set("None")
+        self.bind("<Configure>", self._on_window_configure)
+        self.bind("<Map>", self._on_first_map, add="+")
 
         self._refresh_scene()
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
+    # ----------------------- Startup -----------------------
+
+    def _on_first_map(self, event):
+        if event.widget is not self or self.first_frame_ms is not None:
+            return
+        # Draw now, then start the deferred loads on the next turn of the loop.
+        self.update_idletasks()
+        self.first_frame_ms = (time.perf_counter() - LAUNCHED) * 1000.0
+        self.early_modules = tuple(m for m in DEFERRED_MODULES if m in sys.modules)
+        self.after(1, self._start_deferred_startup)
+
+    def _start_deferred_startup(self):
+        # One worker, so card faces are ready before the slower NumPy import.
+        self.startup_executor = ThreadPoolExecutor(max_workers=1)
+        self.startup_cards = self.startup_executor.submit(self._load_card_assets)
+        self.startup_equity = self.startup_executor.submit(load_equity_module)
+        self.startup_job = self.after(self.STARTUP_POLL_MS, self._poll_startup)
+
+    def _load_card_assets(self):
+        # Runs on the startup worker.
+        load_card_modules()
+        return self._build_card_file_index()
+
+    def _poll_startup(self):
+        self.startup_job = None
+        if self.startup_cards is not None and self.startup_cards.done():
+            future, self.startup_cards = self.startup_cards, None
+            try:
+                self.card_paths = future.result()
+            except Exception as exc:
+                print(f"WARNING: card images unavailable: {exc}", file=sys.stderr)
+            self.startup_pending = False
+            self._start_image_preload()
+            if self.preload_job is None and self.preload_missed:
+                # Nothing to preload; drop the text placeholders now.
+                self.preload_missed = False
+                self._refresh_scene()
+        if self.startup_equity is not None and self.startup_equity.done():
+            self.startup_equity = None
+            if EQUITY_AVAILABLE:
+                self.equity_executor = ThreadPoolExecutor(max_workers=1)
+                if self.stage in STREET_STAGES:
+                    self._start_equity()
+
+        if self.startup_cards is not None or self.startup_equity is not None:
+            self.startup_job = self.after(self.STARTUP_POLL_MS, self._poll_startup)
+            return
+        self.startup_executor.shutdown(wait=False)
+        self.startup_executor = None
+        self._check_startup_done()
+
+    def _check_startup_done(self):
+        """Report startup once every deferred load (including card preload) has finished."""
+        if self.startup_executor is not None or self.startup_pending or self.preload_job is not None:
+            return
+        if self.first_frame_ms is None:
+            return
+        interactive_ms = (time.perf_counter() - LAUNCHED) * 1000.0
+        early = f", loaded before first frame: {', '.join(self.early_modules)}" if self.early_modules else ""
+        print(f"Startup: first frame {self.first_frame_ms:.0f} ms, interactive {interactive_ms:.0f} ms{early}")
+        if self.quit_when_ready:
+            self.after_idle(self._on_close)
+
     # ----------------------- UI -----------------------
 
     def _build_ui(self):
@@ -120,6 +374,93 @@ class RTPDrillzApp(tk.Tk):
         )
         self.timer_menu.pack(side="left")
 
+        texture_label = tk.Label(
+            timer_wrap,
+            text="Flop:",
+            font=("Helvetica", 12, "bold"),
+            fg=self.TEXT,
+            bg=self.DARK_BG,
+        )
+        texture_label.pack(side="left", padx=(16, 8))
+
+        self.texture_menu = tk.OptionMenu(timer_wrap, self.texture_var, *self.FLOP_TEXTURE_OPTIONS)
+        self.texture_menu.config(
+            font=("Helvetica", 11),
+            bg="#2b2b2b",
+            fg=self.WHITE,
+            activebackground=self.ORANGE,
+            activeforeground="#111111",
+            highlightthickness=0,
+            bd=0,
+            width=13,
+        )
+        self.texture_menu["menu"].config(
+            bg="#2b2b2b",
+            fg=self.WHITE,
+            activebackground=self.ORANGE,
+            activeforeground="#111111",
+            font=("Helvetica", 11),
+        )
+        self.texture_menu.pack(side="left")
+
+        range_label = tk.Label(
+            timer_wrap,
+            text="Range:",
+            font=("Helvetica", 12, "bold"),
+            fg=self.TEXT,
+            bg=self.DARK_BG,
+        )
+        range_label.pack(side="left", padx=(16, 8))
+
+        self.range_menu = tk.OptionMenu(timer_wrap, self.range_var, *self.RANGE_OPTIONS)
+        self.range_menu.config(
+            font=("Helvetica", 11),
+            bg="#2b2b2b",
+            fg=self.WHITE,
+            activebackground=self.ORANGE,
+            activeforeground="#111111",
+            highlightthickness=0,
+            bd=0,
+            width=8,
+        )
+        self.range_menu["menu"].config(
+            bg="#2b2b2b",
+            fg=self.WHITE,
+            activebackground=self.ORANGE,
+            activeforeground="#111111",
+            font=("Helvetica", 11),
+        )
+        self.range_menu.pack(side="left")
+
+        deal_mode_label = tk.Label(
+            timer_wrap,
+            text="Deal:",
+            font=("Helvetica", 12, "bold"),
+            fg=self.TEXT,
+            bg=self.DARK_BG,
+        )
+        deal_mode_label.pack(side="left", padx=(16, 8))
+
+        self.deal_mode_menu = tk.OptionMenu(timer_wrap, self.deal_mode_var, *self.DEAL_MODES)
+        self.deal_mode_menu.config(
+            font=("Helvetica", 11),
+            bg="#2b2b2b",
+            fg=self.WHITE,
+            activebackground=self.ORANGE,
+            activeforeground="#111111",
+            highlightthickness=0,
+            bd=0,
+            width=10,
+        )
+        self.deal_mode_menu["menu"].config(
+            bg="#2b2b2b",
+            fg=self.WHITE,
+            activebackground=self.ORANGE,
+            activeforeground="#111111",
+            font=("Helvetica", 11),
+        )
+        self.deal_mode_menu.pack(side="left")
+
         self.table_frame = tk.Frame(
             self,
             bg=self.FELT_BG,
@@ -174,7 +515,16 @@ class RTPDrillzApp(tk.Tk):
             fg=self.TEXT,
             bg=self.FELT_BG,
         )
-        self.status_label.pack(pady=(8, 16))
+        self.status_label.pack(pady=(8, 4))
+
+        self.equity_label = tk.Label(
+            self.table_frame,
+            textvariable=self.equity_var,
+            font=("Helvetica", 14, "bold"),
+            fg=self.ORANGE,
+            bg=self.FELT_BG,
+        )
+        self.equity_label.pack(pady=(0, 16))
 
         hand_wrap = tk.Frame(self, bg=self.DARK_BG)
         hand_wrap.pack(fill="x", padx=20, pady=(0, 10))
@@ -194,266 +544,475 @@ class RTPDrillzApp(tk.Tk):
         self.controls_frame = tk.Frame(self, bg=self.DARK_BG)
         self.controls_frame.pack(fill="x", padx=20, pady=(6, 20))
 
-    def _set_controls(self, buttons):
-        for w in self.controls_frame.winfo_children():
-            w.destroy()
+        self._build_scene_pools()
+
+    # Card slots and buttons are created once and reused. Each frame only
+    # reconfigures widgets whose content changed; self.render_touched
+    # counts those updates and self.frame_times keeps recent refresh times.
+
+    def _build_scene_pools(self):
+        self.board_empty_label = tk.Label(
+            self.board_cards_frame,
+            text="No board yet",
+            font=("Helvetica", 12),
+            fg=self.TEXT,
+            bg=self.FELT_BG,
+        )
+        self.board_slots = [self._create_card_widget(self.board_cards_frame, i, padx=6, pady=6) for i in range(5)]
+        self.hand_slots = [self._create_card_widget(self.hand_cards_frame, i, padx=8, pady=4) for i in range(2)]
 
         row = tk.Frame(self.controls_frame, bg=self.DARK_BG)
         row.pack()
+        self.control_buttons = [self._create_control_button(row, i) for i in range(3)]
 
-        for text, cmd, primary in buttons:
-            btn = tk.Button(
-                row,
-                text=text,
-                command=cmd,
-                font=("Helvetica", 16 if primary else 13, "bold"),
-                bg=self.ORANGE if primary else "#2a2a2a",
-                fg="#111111" if primary else self.WHITE,
-                activebackground=self.ORANGE_HOVER if primary else "#3a3a3a",
-                activeforeground="#111111" if primary else self.WHITE,
-                relief="flat",
-                bd=0,
-                cursor="hand2",
-                padx=18,
-                pady=10,
-            )
-            self._add_hover(btn, primary)
-            btn.pack(side="left", padx=10)
+        self.board_empty_shown = False
+        self.start_title_shown = True
+        self.render_touched = 0
+        self.frame_times = deque(maxlen=200)
 
-    def _add_hover(self, button, primary):
-        normal = self.ORANGE if primary else "#2a2a2a"
-        hover = self.ORANGE_HOVER if primary else "#3a3a3a"
+    def _create_control_button(self, row, column):
+        btn = tk.Button(
+            row,
+            relief="flat",
+            bd=0,
+            cursor="hand2",
+            padx=18,
+            pady=10,
+        )
+        btn.spec = None
+        btn.shown = False
+        btn.grid_opts = {"row": 0, "column": column, "padx": 10}
+        self._add_hover(btn)
+        return btn
 
-        button.bind("<Enter>", lambda _e: button.config(bg=hover))
-        button.bind("<Leave>", lambda _e: button.config(bg=normal))
+    def _set_controls(self, buttons):
+        for i, btn in enumerate(self.control_buttons):
+            if i >= len(buttons):
+                if btn.shown:
+                    btn.grid_remove()
+                    btn.shown = False
+                    self.render_touched += 1
+                continue
+
+            spec = buttons[i]
+            if btn.spec != spec:
+                text, cmd, primary = spec
+                btn.config(
+                    text=text,
+                    command=cmd,
+                    font=("Helvetica", 16 if primary else 13, "bold"),
+                    bg=self.ORANGE if primary else "#2a2a2a",
+                    fg="#111111" if primary else self.WHITE,
+                    activebackground=self.ORANGE_HOVER if primary else "#3a3a3a",
+                    activeforeground="#111111" if primary else self.WHITE,
+                )
+                btn.spec = spec
+                self.render_touched += 1
+            if not btn.shown:
+                btn.grid(**btn.grid_opts)
+                btn.shown = True
+                self.render_touched += 1
+
+    def _add_hover(self, button):
+        # Bound once per pooled button; colors follow its current spec.
+        def enter(_e):
+            primary = button.spec is not None and button.spec[2]
+            button.config(bg=self.ORANGE_HOVER if primary else "#3a3a3a")
+
+        def leave(_e):
+            primary = button.spec is not None and button.spec[2]
+            button.config(bg=self.ORANGE if primary else "#2a2a2a")
+
+        button.bind("<Enter>", enter)
+        button.bind("<Leave>", leave)
 
     def _refresh_scene(self):
+        started = time.perf_counter()
+        self.render_touched = 0
+
         self._render_board()
         self._render_hand()
 
         if self.stage == "start":
-            self.start_title.place(relx=0.5, rely=0.45, anchor="center")
-            self.status_label.config(text="Pick a timer and deal a hand.")
+            self._show_start_title(True)
+            self._set_status("Pick a timer and deal a hand.")
             self._set_controls([("Deal Hand", self.deal_hand, True)])
         elif self.stage == "hand":
-            self.start_title.place_forget()
-            self.status_label.config(text="Keep this hand or reroll.")
+            self._show_start_title(False)
+            if self.review_key is not None:
+                self._set_status(f"Review spot ({self.review.due_count()} more due). Keep this hand to replay it.")
+            else:
+                self._set_status("Keep this hand or reroll.")
             self._set_controls([
                 ("Keep Hand", self.keep_hand, True),
                 ("New Hand", self.deal_hand, False),
             ])
         elif self.stage == "flop":
-            self.start_title.place_forget()
-            self.status_label.config(text="Flop dealt. Make your decision.")
+            self._show_start_title(False)
+            self._set_status("Flop dealt. Make your decision.")
             self._set_controls([
                 ("Keep Flop \u2192 Turn", self.keep_flop, True),
                 ("New Flop", self.new_flop, False),
             ])
         elif self.stage == "turn":
-            self.start_title.place_forget()
-            self.status_label.config(text="Turn dealt. Decide and continue.")
+            self._show_start_title(False)
+            self._set_status("Turn dealt. Decide and continue.")
             self._set_controls([
                 ("Keep Turn \u2192 River", self.keep_turn, True),
                 ("New Turn", self.new_turn, False),
             ])
         elif self.stage == "river":
-            self.start_title.place_forget()
-            self.status_label.config(text="River dealt. Final decision spot.")
+            self._show_start_title(False)
+            self._set_status("River dealt. Final decision spot.")
             self._set_controls([
                 ("Keep River", self.keep_river, True),
                 ("New River", self.new_river, False),
             ])
         elif self.stage == "done":
-            self.start_title.place_forget()
-            self.status_label.config(text="Drill complete. Final board locked.")
-            self._set_controls([
+            self._show_start_title(False)
+            self._set_status("Drill complete. Final board locked.")
+            controls = [
                 ("Deal Hand", self.deal_hand, True),
                 ("New River", self.new_river, False),
-            ])
-
-    def _render_board(self):
-        for w in self.board_cards_frame.winfo_children():
-            w.destroy()
-
-        if not self.board:
-            empty = tk.Label(
-                self.board_cards_frame,
-                text="No board yet",
-                font=("Helvetica", 12),
-                fg=self.TEXT,
-                bg=self.FELT_BG,
-            )
-            empty.pack()
+            ]
+            if self.last_record is not None:
+                controls.append(("Flag Mistake", self.flag_mistake, False))
+            self._set_controls(controls)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.frame_times.append(elapsed_ms)
+        if self.FRAME_STATS:
+            print(f"Scene refresh ({self.stage}): {elapsed_ms:.2f} ms, {self.render_touched} widgets updated")
+
+    def _show_start_title(self, show):
+        if show == self.start_title_shown:
             return
+        if show:
+            self.start_title.place(relx=0.5, rely=0.45, anchor="center")
+        else:
+            self.start_title.place_forget()
+        self.start_title_shown = show
+        self.render_touched += 1
 
-        for card in self.board:
-            widget = self._create_card_widget(self.board_cards_frame, card_code=card)
-            widget.pack(side="left", padx=6, pady=6)
-
-    def _render_hand(self):
-        for w in self.hand_cards_frame.winfo_children():
-            w.destroy()
+    def _set_status(self, text):
+        if self.status_label.cget("text") != text:
+            self.status_label.config(text=text)
+            self.render_touched += 1
 
-        if not self.hand:
-            for _ in range(2):
-                widget = self._create_card_widget(self.hand_cards_frame, back=True)
-                widget.pack(side="left", padx=8, pady=4)
-            return
+    def _render_board(self):
+        show_empty = not self.board
+        if show_empty != self.board_empty_shown:
+            if show_empty:
+                self.board_empty_label.grid(row=0, column=0)
+            else:
+                self.board_empty_label.grid_remove()
+            self.board_empty_shown = show_empty
+            self.render_touched += 1
+
+        for i, slot in enumerate(self.board_slots):
+            if i < len(self.board):
+                self._update_card_widget(slot, card_code=self.board[i])
+            else:
+                self._hide_card_widget(slot)
 
-        for card in self.hand:
-            widget = self._create_card_widget(self.hand_cards_frame, card_code=card)
-            widget.pack(side="left", padx=8, pady=4)
+    def _render_hand(self):
+        for i, slot in enumerate(self.hand_slots):
+            if self.hand:
+                self._update_card_widget(slot, card_code=self.hand[i])
+            else:
+                self._update_card_widget(slot, back=True)
 
-    def _create_card_widget(self, parent, card_code=None, back=False):
+    def _create_card_widget(self, parent, column, padx, pady):
         outer = tk.Frame(parent, bg=self.ORANGE, padx=2, pady=2)
-        photo = self._get_back_image() if back else self._get_card_image(card_code)
-
-        if photo is not None:
-            lbl = tk.Label(outer, image=photo, bg="#ffffff", bd=0)
-            lbl.image = photo
-            lbl.pack()
-        else:
-            txt = "BACK" if back else self._format_card(card_code)
-            canvas = tk.Canvas(
-                outer,
-                width=self.card_width,
-                height=self.card_height,
-                bg="#ffffff",
-                highlightthickness=0,
-            )
-            canvas.create_text(
-                self.card_width // 2,
-                self.card_height // 2,
-                text=txt,
-                font=("Helvetica", 18, "bold"),
-                fill="#222222",
-            )
-            canvas.pack()
+        outer.image_label = tk.Label(outer, bg="#ffffff", bd=0)
+        outer.text_canvas = tk.Canvas(
+            outer,
+            width=self.card_width,
+            height=self.card_height,
+            bg="#ffffff",
+            highlightthickness=0,
+        )
+        outer.text_id = outer.text_canvas.create_text(
+            self.card_width // 2,
+            self.card_height // 2,
+            text="",
+            font=("Helvetica", 18, "bold"),
+            fill="#222222",
+        )
+        outer.grid_opts = {"row": 0, "column": column, "padx": padx, "pady": pady}
+        outer.content = None
+        outer.shown = False
         return outer
 
+    def _update_card_widget(self, slot, card_code=None, back=False):
+        photo = self._get_back_image() if back else self._get_card_image(card_code)
+        content = ("back" if back else card_code, photo is not None)
+
+        if slot.content != content:
+            if photo is not None:
+                slot.image_label.config(image=photo)
+                slot.image_label.image = photo
+                if slot.content is None or not slot.content[1]:
+                    slot.text_canvas.pack_forget()
+                    slot.image_label.pack()
+            else:
+                txt = "BACK" if back else self._format_card(card_code)
+                slot.text_canvas.itemconfig(slot.text_id, text=txt)
+                if slot.content is None or slot.content[1]:
+                    slot.image_label.pack_forget()
+                    slot.text_canvas.pack()
+            slot.content = content
+            self.render_touched += 1
+
+        if not slot.shown:
+            slot.grid(**slot.grid_opts)
+            slot.shown = True
+            self.render_touched += 1
+
+    def _hide_card_widget(self, slot):
+        if slot.shown:
+            slot.grid_remove()
+            slot.shown = False
+            self.render_touched += 1
+
     # ----------------------- Game Logic -----------------------
+    # State and transitions live in DrillEngine; these handlers only drive
+    # the timer and redraw.
+
+    @property
+    def hand(self):
+        return self.engine.hand
+
+    @property
+    def board(self):
+        return self.engine.board
+
+    @property
+    def stage(self):
+        return self.engine.stage
 
     def deal_hand(self):
         self._stop_timer(reset_display=True)
         self._hide_time_overlay()
         self._set_felt_bg(self.FELT_BG)
-
-        self.hand = self._generate_playable_hand()
-        self.board = []
-        self.stage = "hand"
+        self._cancel_equity()
+
+        self.review_key = None
+        if self.review is not None and self.deal_mode_var.get() == "Review due":
+            self.review_key = self.review.next_spot()
+        if self.review_key is not None:
+            hand, board = self.review_key
+            self.engine.deal_spot(split_cards(hand), split_cards(board))
+        else:
+            self.engine.deal_hand()
+        self.last_record = None
+        self.street_started = None
+        self.decision_ms = {}
+        self.street_timeouts = 0
         self._refresh_scene()
 
     def keep_hand(self):
-        self._enter_flop()
+        self._enter_street(self.engine.keep_hand)
 
     def new_flop(self):
-        self._enter_flop()
+        self._enter_street(self.engine.new_flop)
 
     def keep_flop(self):
-        self._enter_turn()
+        self._enter_street(self.engine.keep_flop)
 
     def new_turn(self):
-        self._enter_turn()
+        self._enter_street(self.engine.new_turn)
 
     def keep_turn(self):
-        self._enter_river()
+        self._enter_street(self.engine.keep_turn)
 
     def new_river(self):
-        self._enter_river()
+        self._enter_street(self.engine.new_river)
 
     def keep_river(self):
-        self.stage = "done"
+        decided = time.monotonic()
+        if not self.engine.keep_river():
+            return
+        self._note_decision(decided, "river")
         self._stop_timer(reset_display=True)
         self._hide_time_overlay()
+        self._record_drill()
         self._refresh_scene()
 
-    def _enter_flop(self):
-        if len(self.hand) != 2:
+    def _enter_street(self, transition):
+        decided = time.monotonic()
+        stage = self.stage
+        if not transition():
             return
-        self._reset_deck(excluded=self.hand)
-        self.board = [self._deal_card(), self._deal_card(), self._deal_card()]
-        self.stage = "flop"
+        self._note_decision(decided, stage)
+        self.street_started = time.monotonic()
         self._refresh_scene()
         self._start_timer_for_street()
+        self._start_equity()
+
+    def _note_decision(self, decided, stage):
+        # A reroll restarts the clock, so only the last deal on a street counts.
+        if stage in STREET_STAGES and self.street_started is not None:
+            self.decision_ms[stage] = round((decided - self.street_started) * 1000)
+
+    def _record_drill(self):
+        self.last_record = self.history.record(
+            DrillRecord(
+                hand=list(self.hand),
+                board=list(self.board),
+                tags=self.engine.flop_textures,
+                decision_ms=dict(self.decision_ms),
+                timeouts=self.street_timeouts,
+            )
+        )
+        review = (
+            "review",
+            self._spot_of(self.last_record),
+            sum(self.decision_ms.values()),
+            self.street_timeouts > 0,
+            self.last_record.played_at,
+        )
+        if self.review is not None:
+            self._apply_review_event(review)
+        elif self.review_backlog is not None:
+            self.review_backlog.append(review)
 
-    def _enter_turn(self):
-        if len(self.board) < 3:
+    def flag_mistake(self):
+        if self.last_record is None:
             return
-        flop = self.board[:3]
-        self._reset_deck(excluded=self.hand + flop)
-        turn = self._deal_card()
-        self.board = flop + [turn]
-        self.stage = "turn"
+        self.history.flag(self.last_record)
+        flag = ("flag", self._spot_of(self.last_record), time.time())
+        if self.review is not None:
+            self._apply_review_event(flag)
+        elif self.review_backlog is not None:
+            self.review_backlog.append(flag)
+        self.last_record = None
         self._refresh_scene()
-        self._start_timer_for_street()
+        self._set_status("Flagged as a mistake. This spot will come back for review.")
 
-    def _enter_river(self):
-        if len(self.board) < 4:
+    def _spot_of(self, record):
+        return "".join(record.hand), "".join(record.board)
+
+    # ----------------------- Review scheduling -----------------------
+
+    def _on_deal_mode_change(self, *_):
+        if self.deal_mode_var.get() not in self.DEAL_MODES:
+            self.deal_mode_var.set("Random")
+            return
+        if self.deal_mode_var.get() == "Review due" and self.review is None and self.review_future is None:
+            self.review_executor = ThreadPoolExecutor(max_workers=1)
+            self.review_backlog = []
+            self.review_future = self.review_executor.submit(self._load_review_scheduler)
+            self.review_poll_job = self.after(self.REVIEW_POLL_MS, self._poll_review_load)
+            self._set_status("Loading drill history for review...")
+
+    def _load_review_scheduler(self):
+        # Runs on the review worker thread, the only user of the history reader.
+        self.history.flush()
+        scheduler = ReviewScheduler()
+        scheduler.load(self.history.spot_stats(scheduler.slow_ms))
+        # Moves every already-due spot into the ready heap off the Tk thread.
+        due = scheduler.due_count()
+        return scheduler, due
+
+    def _poll_review_load(self):
+        future = self.review_future
+        if not future.done():
+            self.review_poll_job = self.after(self.REVIEW_POLL_MS, self._poll_review_load)
             return
-        first_four = self.board[:4]
-        self._reset_deck(excluded=self.hand + first_four)
-        river = self._deal_card()
-        self.board = first_four + [river]
-        self.stage = "river"
-        self._refresh_scene()
-        self._start_timer_for_street()
 
-    def _build_full_deck(self):
-        return [r + s for r in self.RANKS for s in self.SUITS]
+        self.review_poll_job = None
+        self.review_future = None
+        backlog, self.review_backlog = self.review_backlog, None
+        try:
+            self.review, due = future.result()
+        except Exception as exc:
+            self._set_status(f"Could not load drill history: {exc}")
+            return
+        # Drills finished after the worker's flush missed the load.
+        for event in backlog:
+            self._apply_review_event(event, skip_loaded=True)
+        if backlog:
+            due = self.review.due_count()
+        self._set_status(f"Review mode: {due} of {len(self.review)} spots due.")
+
+    def _apply_review_event(self, event, skip_loaded=False):
+        if event[0] == "flag":
+            _, key, flagged_at = event
+            # A no-op when the loaded stats already have the flag.
+            self.review.flag(key, now=flagged_at)
+            return
+        _, key, decision_ms, timed_out, played_at = event
+        stats = self.review.stats.get(key)
+        if skip_loaded and stats is not None and played_at <= stats.last_played:
+            return  # already in the history the scheduler loaded
+        self.review.review(key, decision_ms, lapse=timed_out, played_at=played_at)
 
-    def _reset_deck(self, excluded=None):
-        excluded = set(excluded or [])
-        self.deck = [c for c in self._build_full_deck() if c not in excluded]
-        random.shuffle(self.deck)
+    # ----------------------- Equity -----------------------
 
-    def _deal_card(self):
-        if not self.deck:
-            self._reset_deck(excluded=self.hand + self.board)
-        return self.deck.pop()
+    def _start_equity(self):
+        self._cancel_equity()
+        if self.equity_executor is None:
+            return
 
-    def _generate_playable_hand(self):
-        deck = self._build_full_deck()
-        while True:
-            c1, c2 = random.sample(deck, 2)
-            if self._is_playable_hand(c1, c2):
-                return sorted([c1, c2], key=lambda c: self._rank_value(c[0]), reverse=True)
-
-    def _rank_value(self, rank):
-        return self.RANKS.index(rank.upper()) + 2
-
-    def _is_playable_hand(self, c1, c2):
-        r1, s1 = c1[0], c1[1]
-        r2, s2 = c2[0], c2[1]
-        v1 = self._rank_value(r1)
-        v2 = self._rank_value(r2)
-
-        if v1 == v2:
-            return True  # all pairs
-
-        suited = (s1 == s2)
-        if suited:
-            return True  # very wide suited range
-
-        high, low = max(v1, v2), min(v1, v2)
-        gap = high - low - 1
-
-        # Wide offsuit playable range, but avoids obvious trash.
-        if high >= 12 and low >= 10:  # QTo+, broadway-heavy
-            return True
-        if high == 14 and low >= 7:   # A7o+
-            return True
-        if high == 13 and low >= 9:   # K9o+
-            return True
-        if high == 12 and low >= 9:   # Q9o+
-            return True
-        if high == 11 and low >= 9:   # J9o+
-            return True
-        if high >= 10 and low >= 7 and gap <= 2:  # 87o/98o/T9o + one/two gappers
-            return True
-        if (high, low) in {(9, 8), (8, 7)}:
-            return True
-
-        return False
+        self.equity_var.set("Equity vs range: ...")
+        self.equity_future = self.equity_executor.submit(
+            self._compute_equity, list(self.hand), list(self.board), self.engine.hand_range
+        )
+        self.equity_poll_job = self.after(self.EQUITY_POLL_MS, self._poll_equity)
+
+    def _compute_equity(self, hand, board, hand_range):
+        # Runs on the equity worker thread. Villain plays the active range.
+        key = None
+        if len(board) == 3:
+            key = (hand_range.text, spot_key([from_code(c) for c in board], [from_code(c) for c in hand]))
+            cached = self.equity_cache.get(key)
+            if cached is not None:
+                self.equity_cache.move_to_end(key)
+                return cached
+
+        result = hero_equity(
+            hand,
+            board,
+            hand_range.pairs,
+            iterations=self.EQUITY_ITERATIONS,
+            villain_weights=hand_range.weights,
+            target_stderr=self.EQUITY_STDERR,
+        )
+        if key is not None:
+            self.equity_cache[key] = result
+            if len(self.equity_cache) > self.EQUITY_CACHE_SIZE:
+                self.equity_cache.popitem(last=False)
+        return result
+
+    def _poll_equity(self):
+        future = self.equity_future
+        if future is None:
+            self.equity_poll_job = None
+            return
+        if not future.done():
+            self.equity_poll_job = self.after(self.EQUITY_POLL_MS, self._poll_equity)
+            return
+
+        self.equity_poll_job = None
+        self.equity_future = None
+        try:
+            result = future.result()
+        except Exception:
+            self.equity_var.set("")
+            return
+        self.equity_var.set(f"Equity vs range: {result.equity * 100:.1f}%")
+
+    def _cancel_equity(self):
+        # A computation already running is left to finish; its result is
+        # dropped because equity_future no longer points at it.
+        if self.equity_poll_job is not None:
+            self.after_cancel(self.equity_poll_job)
+            self.equity_poll_job = None
+        if self.equity_future is not None:
+            self.equity_future.cancel()
+            self.equity_future = None
+        self.equity_var.set("")
 
     # ----------------------- Timer -----------------------
 
@@ -467,29 +1026,53 @@ class RTPDrillzApp(tk.Tk):
             self.countdown_var.set("Time left: --:--")
             return
 
-        self.time_left = seconds
-        self._update_countdown()
-        self.timer_job = self.after(1000, self._tick_timer)
+        self.timer_deadline = time.monotonic() + seconds
+        self._schedule_timer_tick(self._update_countdown())
+
+    def _schedule_timer_tick(self, delay_s):
+        delay_ms = max(1, math.ceil(delay_s * 1000))
+        self.timer_expected = time.monotonic() + delay_ms / 1000.0
+        self.timer_job = self.after(delay_ms, self._tick_timer)
 
     def _tick_timer(self):
-        self.time_left -= 1
-        self._update_countdown()
+        now = time.monotonic()
+        self.timer_latencies.append((now - self.timer_expected) * 1000.0)
 
-        if self.time_left <= 0:
+        delay_s = self._update_countdown(now)
+        if delay_s is None:
             self.timer_job = None
             self._time_up()
             return
 
-        self.timer_job = self.after(1000, self._tick_timer)
+        self._schedule_timer_tick(delay_s)
+
+    def _update_countdown(self, now=None):
+        """Show the time left; return seconds until the display next changes, or None at zero."""
+        remaining = self.timer_deadline - (time.monotonic() if now is None else now)
+        if remaining <= 0:
+            self.countdown_var.set("Time left: 00:00")
+            return None
+
+        if remaining > self.TIMER_SUBSECOND_BELOW:
+            shown = math.ceil(remaining)
+            mm, ss = divmod(shown, 60)
+            self.countdown_var.set(f"Time left: {mm:02d}:{ss:02d}")
+            return remaining - (shown - 1)
 
-    def _update_countdown(self):
-        if self.time_left < 0:
-            self.time_left = 0
-        mm = self.time_left // 60
-        ss = self.time_left % 60
-        self.countdown_var.set(f"Time left: {mm:02d}:{ss:02d}")
+        tenths = math.ceil(remaining * 10)
+        self.countdown_var.set(f"Time left: 00:{tenths / 10:04.1f}")
+        return remaining - (tenths - 1) / 10.0
+
+    def _timer_latency_summary(self):
+        if not self.timer_latencies:
+            return None
+        late = sorted(self.timer_latencies)
+        p95 = late[min(len(late) - 1, int(len(late) * 0.95))]
+        mean = sum(late) / len(late)
+        return f"Timer ticks: {len(late)}, late by mean {mean:.1f} ms, p95 {p95:.1f} ms, max {late[-1]:.1f} ms"
 
     def _time_up(self):
+        self.street_timeouts += 1
         self._show_time_overlay()
         self._flash_table()
 
@@ -531,53 +1114,103 @@ class RTPDrillzApp(tk.Tk):
         if choice not in self.TIMER_OPTIONS:
             self.timer_var.set("None")
             choice = "None"
-        self._save_timer_choice(choice)
+        self.settings.update(timer=choice)
 
-        if self.stage in {"flop", "turn", "river"}:
+        if self.stage in STREET_STAGES:
             self._start_timer_for_street()
         elif choice == "None":
             self.countdown_var.set("Time left: --:--")
 
+    def _on_texture_choice_change(self, *_):
+        choice = self.texture_var.get()
+        if choice not in self.FLOP_TEXTURE_OPTIONS:
+            self.texture_var.set("Any")
+            return
+        self.settings.update(flop_texture=choice)
+        # Applies from the next flop dealt; the current board is kept.
+        self.engine.flop_textures = self.FLOP_TEXTURE_OPTIONS[choice]
+
+    def _on_range_choice_change(self, *_):
+        choice = self.range_var.get()
+        if choice not in self.RANGE_OPTIONS:
+            self.range_var.set("Playable")
+            return
+        self.settings.update(range=choice)
+        # Applies from the next hand dealt.
+        self.engine.hand_range = spot_range(*self.RANGE_OPTIONS[choice])
+
     # ----------------------- Cards / Images -----------------------
 
     def _build_card_file_index(self):
-        index = {}
+        # Card code -> path, served from the manifest unless a deck folder changed.
+        return load_card_manifest(self.script_dir, self.manifest_path)
+
+    def _start_image_preload(self):
+        if not PIL_AVAILABLE:
+            return
+        paths = self.card_paths
+        if not paths:
+            return
+
+        self.preload_pending = set(paths)
+        self.preload_started = time.perf_counter()
+        self.preload_executor = ThreadPoolExecutor(max_workers=self.PRELOAD_WORKERS)
+        for code, path in paths.items():
+            self.preload_executor.submit(self._preload_image, code, path)
+        self.preload_job = self.after(self.PRELOAD_POLL_MS, self._poll_image_preload)
+
+    def _preload_image(self, code, path):
+        # Runs on a preload worker thread.
         try:
-            entries = os.listdir(self.script_dir)
-        except OSError:
-            return index
-
-        # PNG files directly beside script.
-        for name in entries:
-            path = os.path.join(self.script_dir, name)
-            if os.path.isfile(path) and name.lower().endswith(".png"):
-                index[name.lower()] = path
-
-        # Scan likely deck/image folders one level below.
-        likely_tokens = ("card", "deck", "png", "image", "img")
-        for name in entries:
-            path = os.path.join(self.script_dir, name)
-            if not os.path.isdir(path):
-                continue
-            if not any(t in name.lower() for t in likely_tokens):
-                continue
+            im = load_resized(path, self.card_height, self.thumb_cache_dir)
+        except Exception:
+            im = None
+        self.image_queue.put((code, im))
 
-            for root, dirs, files in os.walk(path):
-                depth = os.path.relpath(root, path).count(os.sep)
-                if depth > 2:
-                    dirs[:] = []
-                    continue
-                for f in files:
-                    if f.lower().endswith(".png"):
-                        index.setdefault(f.lower(), os.path.join(root, f))
+    def _poll_image_preload(self):
+        arrived = False
+        while True:
+            try:
+                code, im = self.image_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.preload_pending.discard(code)
+            if im is None:
+                continue
+            photo = ImageTk.PhotoImage(im)
+            if code == "back":
+                self.back_image_cache = photo
+            else:
+                self.card_image_cache[code] = photo
+            arrived = True
+
+        # Redraw once if a render fell back to text while images were loading.
+        if arrived and self.preload_missed:
+            self.preload_missed = False
+            self._refresh_scene()
+
+        if self.preload_pending:
+            self.preload_job = self.after(self.PRELOAD_POLL_MS, self._poll_image_preload)
+            return
 
-        return index
+        self.preload_job = None
+        self.preload_executor.shutdown(wait=False)
+        elapsed_ms = (time.perf_counter() - self.preload_started) * 1000.0
+        loaded = len(self.card_image_cache) + (1 if self.back_image_cache is not None else 0)
+        print(f"Card image cache warm: {loaded} images in {elapsed_ms:.0f} ms")
+        self._check_startup_done()
 
     def _get_card_image(self, code):
+        if self.startup_pending:
+            self.preload_missed = True
+            return None
         if not PIL_AVAILABLE or not code:
             return None
         if code in self.card_image_cache:
             return self.card_image_cache[code]
+        if code in self.preload_pending:
+            self.preload_missed = True
+            return None
 
         path = self._find_card_file(code)
         if not path:
@@ -591,10 +1224,16 @@ class RTPDrillzApp(tk.Tk):
         return img
 
     def _get_back_image(self):
+        if self.startup_pending:
+            self.preload_missed = True
+            return None
         if not PIL_AVAILABLE:
             return None
         if self.back_image_cache is not None:
             return self.back_image_cache
+        if "back" in self.preload_pending:
+            self.preload_missed = True
+            return None
 
         path = self._find_back_file()
         if not path:
@@ -605,51 +1244,18 @@ class RTPDrillzApp(tk.Tk):
         return img
 
     def _load_and_resize(self, path):
+        # Resized copies live in thumb_cache_dir, so warm starts skip
+        # decoding and resampling the full-size PNG.
         try:
-            resample = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
-            with Image.open(path) as im:
-                im = im.convert("RGBA")
-                ratio = self.card_height / float(im.height)
-                width = max(1, int(im.width * ratio))
-                im = im.resize((width, self.card_height), resample)
-                return ImageTk.PhotoImage(im)
+            return ImageTk.PhotoImage(load_resized(path, self.card_height, self.thumb_cache_dir))
         except Exception:
             return None
 
     def _find_card_file(self, code):
-        rank = code[0].upper()
-        suit = code[1].lower()
-
-        rank_variants = [rank, rank.lower()]
-        if rank == "T":
-            rank_variants.extend(["10"])
-
-        suit_variants = [suit, suit.upper()]
-
-        candidates = set()
-        for r in rank_variants:
-            for s in suit_variants:
-                candidates.add(f"{r}{s}.png".lower())
-                candidates.add(f"{r}_{s}.png".lower())
-
-        return self._lookup_index(candidates)
+        return self.card_paths.get(self._format_card(code))
 
     def _find_back_file(self):
-        candidates = {
-            "back.png",
-            "cardback.png",
-            "card_back.png",
-            "backside.png",
-            "blue_back.png",
-            "red_back.png",
-        }
-        return self._lookup_index(candidates)
-
-    def _lookup_index(self, names):
-        for name in names:
-            if name in self.card_file_index:
-                return self.card_file_index[name]
-        return None
+        return self.card_paths.get("back")
 
     def _format_card(self, code):
         if not code:
@@ -658,28 +1264,24 @@ class RTPDrillzApp(tk.Tk):
 
     # ----------------------- Config / Utility -----------------------
 
-    def _load_timer_choice(self):
+    def _restore_geometry(self):
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                value = f.read().strip()
-            if value in self.TIMER_OPTIONS:
-                return value
-        except OSError:
-            pass
-        return "None"
-
-    def _save_timer_choice(self, value):
-        try:
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                f.write(value)
-        except OSError:
-            pass
+            self.geometry(self.settings.get("geometry"))
+        except tk.TclError:
+            self.geometry(DEFAULT_SETTINGS["geometry"])
+
+    def _on_window_configure(self, event):
+        # <Configure> also fires for every child widget; only the window counts.
+        # Zoomed/iconic states are not saved so the next start opens normally.
+        if event.widget is self and self.state() == "normal":
+            self.settings.update(geometry=self.geometry())
 
     def _set_felt_bg(self, color):
         self.table_frame.config(bg=color)
         self.board_title.config(bg=color)
         self.board_cards_frame.config(bg=color)
         self.status_label.config(bg=color)
+        self.equity_label.config(bg=color)
         self.start_title.config(bg=color)
         self.countdown_label.config(bg=color)
         self.time_overlay.config(bg=color)
@@ -688,9 +1290,58 @@ class RTPDrillzApp(tk.Tk):
         self._stop_timer(reset_display=False)
         if self.flash_job is not None:
             self.after_cancel(self.flash_job)
+        summary = self._timer_latency_summary()
+        if summary:
+            print(summary)
+        self._cancel_equity()
+        if self.startup_job is not None:
+            self.after_cancel(self.startup_job)
+        if self.startup_executor is not None:
+            self.startup_executor.shutdown(wait=False, cancel_futures=True)
+        if self.preload_job is not None:
+            self.after_cancel(self.preload_job)
+        if self.preload_executor is not None:
+            self.preload_executor.shutdown(wait=False, cancel_futures=True)
+        if self.equity_executor is not None:
+            self.equity_executor.shutdown(wait=False, cancel_futures=True)
+        if self.review_poll_job is not None:
+            self.after_cancel(self.review_poll_job)
+        if self.review_executor is not None:
+            self.review_executor.shutdown(wait=False, cancel_futures=True)
+        self.history.close()
+        if self.state() == "normal":
+            self.settings.update(geometry=self.geometry())
+        self.settings.close()
+        if self.profiler is not None:
+            self.profiler.write_trace(self.profile_path)
+            print(self.profiler.summary())
+            print(f"Trace written: {self.profile_path}")
         self.destroy()
 
 
-if __name__ == "__main__":
-    app = RTPDrillzApp()
+def main():
+    parser = argparse.ArgumentParser(description="RTP Drillz desktop drill.")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=RTPDrillzApp.DEFAULT_TRACE_NAME,
+        metavar="TRACE_JSON",
+        help=f"Record UI spans; on exit write a Chrome trace (default {RTPDrillzApp.DEFAULT_TRACE_NAME}) "
+        "and print p50/p95 per span.",
+    )
+    parser.add_argument(
+        "--quit-when-ready",
+        action="store_true",
+        help="Exit as soon as startup finishes (used by benchmarks/bench_startup.py).",
+    )
+    args = parser.parse_args()
+    app = RTPDrillzApp(
+        profile_path=os.path.abspath(args.profile) if args.profile else None,
+        quit_when_ready=args.quit_when_ready,
+    )
     app.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Card image discovery and resized-image cache for the RTP Drillz desktop app.
+
+The resolved card code -> path map is saved to a manifest together with
+the mtime of every deck folder that was scanned and the relevant entries
+of the base directory. Later launches only stat those folders (and list
+the base directory if its mtime moved) and rebuild the map when the deck
+layout has changed.
+
+Resized card images are stored as PNGs in a cache directory, one file per
+(source path, source mtime, source size, target height). Editing or
+replacing a source PNG changes its key, so stale entries are never read;
+--prune removes them from disk; it only touches files named like cache
+entries, so other files in --cache-dir are kept.
+
+Prewarm the cache for the default 140px card height:
+  python3 rtp_drillz_assets.py --height 140
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from rtp_drillz_deck import CARD_CODES
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, "rtp_thumb_cache")
+DEFAULT_MANIFEST = os.path.join(DEFAULT_CACHE_DIR, "card_manifest.json")
+MANIFEST_VERSION = 1
+DEFAULT_CARD_HEIGHT = 140
+
+LIKELY_DECK_TOKENS = ("card", "deck", "png", "image", "img")
+BACK_FILE_NAMES = (
+    "back.png",
+    "cardback.png",
+    "card_back.png",
+    "backside.png",
+    "blue_back.png",
+    "red_back.png",
+)
+
+
+# ----------------------- Card file index -----------------------
+
+def build_card_file_index(base_dir, scanned_dirs=None):
+    """
+    Map lowercase PNG file names to paths beside and below `base_dir`.
+    Every directory listed is appended to `scanned_dirs` when given.
+    """
+    index = {}
+    try:
+        entries = os.listdir(base_dir)
+    except OSError:
+        return index
+    if scanned_dirs is not None:
+        scanned_dirs.append(base_dir)
+
+    # PNG files directly beside script.
+    for name in entries:
+        path = os.path.join(base_dir, name)
+        if os.path.isfile(path) and name.lower().endswith(".png"):
+            index[name.lower()] = path
+
+    # Scan likely deck/image folders one level below.
+    for name in entries:
+        path = os.path.join(base_dir, name)
+        if not os.path.isdir(path):
+            continue
+        if not any(t in name.lower() for t in LIKELY_DECK_TOKENS):
+            continue
+
+        for root, dirs, files in os.walk(path):
+            depth = os.path.relpath(root, path).count(os.sep)
+            if depth > 2:
+                dirs[:] = []
+                continue
+            if scanned_dirs is not None:
+                scanned_dirs.append(root)
+            for f in files:
+                if f.lower().endswith(".png"):
+                    index.setdefault(f.lower(), os.path.join(root, f))
+
+    return index
+
+
+def card_file_candidates(code):
+    rank = code[0].upper()
+    suit = code[1].lower()
+
+    rank_variants = [rank, rank.lower()]
+    if rank == "T":
+        rank_variants.extend(["10"])
+
+    suit_variants = [suit, suit.upper()]
+
+    candidates = set()
+    for r in rank_variants:
+        for s in suit_variants:
+            candidates.add(f"{r}{s}.png".lower())
+            candidates.add(f"{r}_{s}.png".lower())
+    return candidates
+
+
+def lookup_index(index, names):
+    for name in names:
+        if name in index:
+            return index[name]
+    return None
+
+
+# ----------------------- Card manifest -----------------------
+
+def _dir_mtimes(dirs):
+    mtimes = {}
+    for d in dirs:
+        try:
+            mtimes[d] = os.stat(d).st_mtime_ns
+        except OSError:
+            pass
+    return mtimes
+
+
+def _base_entries(base_dir):
+    # Only entries build_card_file_index() could use; unrelated files such
+    # as the settings file do not invalidate the manifest.
+    return sorted(
+        name
+        for name in os.listdir(base_dir)
+        if name.lower().endswith(".png") or any(t in name.lower() for t in LIKELY_DECK_TOKENS)
+    )
+
+
+def _check_manifest(manifest, base_dir):
+    """Return 'fresh', 'touched' (base mtime moved, layout same) or 'stale'."""
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("cards"), dict):
+        return "stale"
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("base_dir") != base_dir:
+        return "stale"
+    dirs = manifest.get("dirs")
+    if not isinstance(dirs, dict):
+        return "stale"
+    try:
+        for d, mtime in dirs.items():
+            if os.stat(d).st_mtime_ns != mtime:
+                return "stale"
+        if os.stat(base_dir).st_mtime_ns == manifest.get("base_mtime"):
+            return "fresh"
+        if _base_entries(base_dir) == manifest.get("base_entries"):
+            return "touched"
+    except OSError:
+        pass
+    return "stale"
+
+
+def _save_manifest(manifest_path, manifest):
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    except OSError:
+        return
+    _write_text_atomic(manifest_path, json.dumps(manifest, indent=2))
+
+
+def load_card_manifest(base_dir, manifest_path=DEFAULT_MANIFEST):
+    """
+    Card code (plus 'back') -> image path for `base_dir`. Reuses the saved
+    manifest while the deck layout is unchanged, otherwise scans again and
+    rewrites it.
+    """
+    base_dir = os.path.abspath(base_dir)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+
+    state = _check_manifest(manifest, base_dir)
+    if state == "fresh":
+        return manifest["cards"]
+    if state == "touched":
+        manifest["base_mtime"] = os.stat(base_dir).st_mtime_ns
+        _save_manifest(manifest_path, manifest)
+        return manifest["cards"]
+
+    # Create the manifest folder before scanning so it does not bump the
+    # base directory mtime afterwards.
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    except OSError:
+        pass
+
+    scanned = []
+    cards = deck_image_paths(build_card_file_index(base_dir, scanned))
+    try:
+        base_mtime = os.stat(base_dir).st_mtime_ns
+        base_entries = _base_entries(base_dir)
+    except OSError:
+        return cards
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "base_dir": base_dir,
+        "base_mtime": base_mtime,
+        "base_entries": base_entries,
+        "dirs": _dir_mtimes(d for d in scanned if d != base_dir),
+        "cards": cards,
+    }
+    _save_manifest(manifest_path, manifest)
+    return cards
+
+
+def _write_text_atomic(path, text):
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except Exception:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+
+
+# ----------------------- Resized image cache -----------------------
+
+def cache_key(path, height):
+    st = os.stat(path)
+    raw = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{height}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def cache_file(cache_dir, path, height):
+    return os.path.join(cache_dir, f"{cache_key(path, height)}.png")
+
+
+def resize_card(path, height):
+    resample = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
+    with Image.open(path) as im:
+        im = im.convert("RGBA")
+        ratio = height / float(im.height)
+        width = max(1, int(im.width * ratio))
+        return im.resize((width, height), resample)
+
+
+def load_resized(path, height, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Return `path` as an RGBA PIL image `height` pixels tall, reading a
+    cached copy when one exists and writing one otherwise. Cache I/O
+    errors fall back to resizing in memory.
+    """
+    try:
+        cached = cache_file(cache_dir, path, height)
+    except OSError:
+        cached = None
+
+    if cached is not None and os.path.isfile(cached):
+        try:
+            with Image.open(cached) as im:
+                im.load()
+                return im if im.mode == "RGBA" else im.convert("RGBA")
+        except Exception:
+            pass
+
+    im = resize_card(path, height)
+    if cached is not None:
+        _write_atomic(im, cache_dir, cached)
+    return im
+
+
+def _write_atomic(im, cache_dir, target):
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                im.save(f, format="PNG", compress_level=1)
+            os.replace(tmp, target)
+        except Exception:
+            os.unlink(tmp)
+            raise
+    except Exception:
+        pass
+
+
+# Names this cache writes: <sha1>.png entries and mkstemp leftovers.
+CACHE_ENTRY_RE = re.compile(r"(?:[0-9a-f]{40}\.png|tmp\w+\.tmp)")
+
+
+def prune_cache(cache_dir, keep):
+    """Delete cache entries not named in `keep`; other files and folders are left alone."""
+    removed = 0
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            if entry.name in keep or not CACHE_ENTRY_RE.fullmatch(entry.name):
+                continue
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                os.unlink(entry.path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def deck_image_paths(index):
+    """Card code (plus 'back') -> source path for every card found in `index`."""
+    paths = {}
+    for code in CARD_CODES:
+        path = lookup_index(index, card_file_candidates(code))
+        if path:
+            paths[code] = path
+    back = lookup_index(index, BACK_FILE_NAMES)
+    if back:
+        paths["back"] = back
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prewarm the RTP Drillz resized card image cache.")
+    parser.add_argument("--base-dir", default=SCRIPT_DIR, help="Directory the desktop app runs from.")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="Card manifest path.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Resized image cache directory.")
+    parser.add_argument("--height", type=int, default=DEFAULT_CARD_HEIGHT, help="Card height in pixels.")
+    parser.add_argument("--prune", action="store_true", help="Delete cache entries not used by this deck/height.")
+    args = parser.parse_args()
+
+    if not PIL_AVAILABLE:
+        print("ERROR: Pillow is required to build the image cache.", file=sys.stderr)
+        return 1
+
+    paths = load_card_manifest(args.base_dir, args.manifest)
+    if not paths:
+        print(f"ERROR: no card images found under {args.base_dir}", file=sys.stderr)
+        return 1
+
+    hits = 0
+    for path in paths.values():
+        if os.path.isfile(cache_file(args.cache_dir, path, args.height)):
+            hits += 1
+        load_resized(path, args.height, args.cache_dir)
+
+    print(f"Cache dir: {args.cache_dir}")
+    print(f"Images: {len(paths)} ({hits} already cached, {len(paths) - hits} resized)")
+
+    if args.prune:
+        keep = {os.path.basename(cache_file(args.cache_dir, p, args.height)) for p in paths.values()}
+        removed = prune_cache(args.cache_dir, keep)
+        print(f"Pruned: {removed}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
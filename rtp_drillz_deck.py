@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Compact deck model for RTP Drillz.
+
+Cards are ints 0-51 (rank index * 4 + suit index, ranks "23456789TJQKA",
+suits "shdc"). Dead cards are tracked as a 64-bit mask and the live cards
+sit at the front of a fixed 52-slot array, so dealing is one step of a
+partial Fisher-Yates shuffle and re-deciding which cards are dead only
+moves the cards whose state changed.
+
+API:
+  deck = Deck()                  # full deck, module-level RNG
+  deck.reset(dead=[0, 51])       # exactly these cards are out of play
+  card = deck.deal()             # random live card, now dead
+  deck.reset(dead=[0, 51])       # reroll: only the dealt card returns
+  len(deck)                      # live cards left
+
+Use to_code()/from_code() to convert to and from strings like "As".
+"""
+
+import random
+
+
+RANKS = "23456789TJQKA"
+SUITS = "shdc"
+
+CARD_CODES = tuple(r + s for r in RANKS for s in SUITS)
+CARD_INDEX = {code: i for i, code in enumerate(CARD_CODES)}
+
+FULL_MASK = (1 << 52) - 1
+
+
+def to_code(card):
+    return CARD_CODES[card]
+
+
+def from_code(code):
+    return CARD_INDEX[code[0].upper() + code[1].lower()]
+
+
+def cards_mask(cards):
+    mask = 0
+    for c in cards:
+        mask |= 1 << c
+    return mask
+
+
+class Deck:
+    """52-card deck with O(1) deals and O(changed cards) resets."""
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
+        self.dead = 0
+        # cards[:live] are in play; pos[c] is the slot currently holding c.
+        self.cards = list(range(52))
+        self.pos = list(range(52))
+        self.live = 52
+
+    def __len__(self):
+        return self.live
+
+    def __contains__(self, card):
+        return not (self.dead >> card) & 1
+
+    def reset(self, dead=()):
+        """Make exactly `dead` the out-of-play cards; every other card is live."""
+        target = cards_mask(dead)
+        diff = self.dead ^ target
+        while diff:
+            low = diff & -diff
+            diff ^= low
+            card = low.bit_length() - 1
+            if target & low:
+                self._kill(card)
+            else:
+                self._revive(card)
+        self.dead = target
+
+    def deal(self):
+        """Remove and return a uniformly random live card."""
+        if self.live == 0:
+            raise ValueError("No live cards left in deck.")
+        i = int(self.rng.random() * self.live)
+        card = self.cards[i]
+        self._kill(card)
+        self.dead |= 1 << card
+        return card
+
+    def _kill(self, card):
+        i = self.pos[card]
+        last = self.live - 1
+        other = self.cards[last]
+        self.cards[i], self.cards[last] = other, card
+        self.pos[other], self.pos[card] = i, last
+        self.live = last
+
+    def _revive(self, card):
+        i = self.pos[card]
+        first = self.live
+        other = self.cards[first]
+        self.cards[i], self.cards[first] = other, card
+        self.pos[other], self.pos[card] = i, first
+        self.live = first + 1
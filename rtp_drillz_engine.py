@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Headless RTP Drillz drill engine.
+
+Holds the street-by-street drill state machine (start -> hand -> flop ->
+turn -> river -> done) and the playable preflop range, with no Tk or PIL
+dependency. The desktop app is a view over one DrillEngine; scripts and CI
+can drive the same engine directly:
+
+  engine = DrillEngine(rng=random.Random(7))
+  engine.deal_hand()
+  engine.keep_hand()      # flop
+  engine.new_flop()       # reroll flop
+  engine.keep_flop()      # turn
+  engine.keep_turn()      # river
+  engine.keep_river()     # done
+  engine.hand, engine.board, engine.stage
+
+Transition methods return True when the stage changed and False when the
+call was not valid from the current stage: Keep moves hand -> flop ->
+turn -> river -> done, New Flop/Turn reroll the current street, and New
+River also rerolls a finished drill's river.
+
+Set `flop_textures` (names from rtp_drillz_textures.TEXTURES) to deal flops
+only from the matching subset, e.g. engine.flop_textures = ("monotone",).
+Set `iso_flops` to deal uniformly over suit-isomorphism classes instead of
+over raw flops (see rtp_drillz_iso). Set `hand_range` to a compiled range
+(rtp_drillz_ranges.compile_range / spot_range) to deal hero hands from it.
+
+deal_spot(hand, board) replays a known spot: the hand is dealt now and the
+Keep transitions reveal `board` street by street. Any New Flop/Turn/River
+reroll drops the rest of the planned board. deal_hand_on_board(board) does
+the same with a hero hand drawn from `hand_range` around the board's
+blockers.
+
+Ranges with frequencies (e.g. "AKo:0.5") are dealt through
+rtp_drillz_sampler.ComboSampler; unweighted ranges keep the plain uniform
+draw so seeded output is unchanged.
+"""
+
+import random
+
+from rtp_drillz_deck import CARD_CODES, CARD_INDEX, Deck, cards_mask
+from rtp_drillz_iso import random_class_flop
+from rtp_drillz_ranges import PLAYABLE_RANGE, compile_range, in_range
+from rtp_drillz_sampler import ComboSampler
+from rtp_drillz_textures import flop_cards, random_matching_flop
+
+
+STAGES = ("start", "hand", "flop", "turn", "river", "done")
+STREET_STAGES = ("flop", "turn", "river")
+
+PLAYABLE = compile_range(PLAYABLE_RANGE)
+
+
+def is_playable_combo(c1, c2):
+    """Playable preflop range test on two card ints."""
+    return in_range(PLAYABLE.mask, c1, c2)
+
+
+def is_playable_hand(c1, c2):
+    """Playable preflop range test on two card codes like 'As', 'Kd'."""
+    return is_playable_combo(CARD_INDEX[c1[0].upper() + c1[1].lower()], CARD_INDEX[c2[0].upper() + c2[1].lower()])
+
+
+def hand_class(c1, c2):
+    """Preflop class like 'AKs', 'T9o' or 'QQ' for two card codes."""
+    a, b = sorted((CARD_INDEX[c1[0].upper() + c1[1].lower()], CARD_INDEX[c2[0].upper() + c2[1].lower()]), reverse=True)
+    ranks = CARD_CODES[a][0] + CARD_CODES[b][0]
+    if ranks[0] == ranks[1]:
+        return ranks
+    return ranks + ("s" if (a & 3) == (b & 3) else "o")
+
+
+# Playable combos as (high, low) int pairs, in ALL_COMBOS order.
+PLAYABLE_COMBOS = PLAYABLE.pairs
+
+
+class DrillEngine:
+    """Street-by-street drill state: hero hand, board and deck."""
+
+    def __init__(self, rng=None, flop_textures=(), iso_flops=False, hand_range=PLAYABLE):
+        self.rng = rng if rng is not None else random
+        self.deck = Deck(self.rng)
+        self.hand_range = hand_range
+        self.flop_textures = tuple(flop_textures)
+        self.iso_flops = iso_flops
+        self.hand = []
+        self.board = []
+        self.planned = []
+        self.stage = "start"
+        self._sampler = None
+
+    # ----------------------- Transitions -----------------------
+
+    def deal_hand(self):
+        self.hand = self.generate_playable_hand()
+        self.board = []
+        self.planned = []
+        self.stage = "hand"
+        return True
+
+    def deal_spot(self, hand, board):
+        self.hand = list(hand)
+        self.board = []
+        self.planned = list(board)
+        self.stage = "hand"
+        return True
+
+    def deal_hand_on_board(self, board):
+        """Deal hero from `hand_range` avoiding `board` (3-5 codes), then play that board."""
+        board = list(board)
+        dead = cards_mask(CARD_INDEX[c] for c in board)
+        c1, c2 = self.sampler().sample(self.rng, dead)
+        self.hand = [CARD_CODES[c1], CARD_CODES[c2]]
+        self.board = []
+        self.planned = board
+        self.stage = "hand"
+        return True
+
+    def keep_hand(self):
+        if self.stage != "hand":
+            return False
+        return self.enter_flop()
+
+    def new_flop(self):
+        if self.stage != "flop":
+            return False
+        self.planned = []
+        return self.enter_flop()
+
+    def keep_flop(self):
+        if self.stage != "flop":
+            return False
+        return self.enter_turn()
+
+    def new_turn(self):
+        if self.stage != "turn":
+            return False
+        self.planned = []
+        return self.enter_turn()
+
+    def keep_turn(self):
+        if self.stage != "turn":
+            return False
+        return self.enter_river()
+
+    def new_river(self):
+        if self.stage not in ("river", "done"):
+            return False
+        self.planned = []
+        return self.enter_river()
+
+    def keep_river(self):
+        if self.stage != "river" or len(self.board) < 5:
+            return False
+        self.stage = "done"
+        return True
+
+    # enter_*() deal a street: the next one (Keep) or the current one again (New).
+
+    def enter_flop(self):
+        if self.stage not in ("hand", "flop") or len(self.hand) != 2:
+            return False
+        if len(self.planned) >= 3:
+            self.board = self.planned[:3]
+            self.reset_deck(excluded=self.hand + self.board)
+        elif self.flop_textures or self.iso_flops:
+            self.board = self.deal_filtered_flop()
+            self.reset_deck(excluded=self.hand + self.board)
+        else:
+            self.reset_deck(excluded=self.hand)
+            self.board = [self.deal_card(), self.deal_card(), self.deal_card()]
+        self.stage = "flop"
+        return True
+
+    def enter_turn(self):
+        if self.stage not in ("flop", "turn") or len(self.board) < 3:
+            return False
+        if len(self.planned) >= 4:
+            self.board = self.planned[:4]
+            self.reset_deck(excluded=self.hand + self.board)
+        else:
+            flop = self.board[:3]
+            self.reset_deck(excluded=self.hand + flop)
+            self.board = flop + [self.deal_card()]
+        self.stage = "turn"
+        return True
+
+    def enter_river(self):
+        if self.stage not in ("turn", "river", "done") or len(self.board) < 4:
+            return False
+        if len(self.planned) >= 5:
+            self.board = self.planned[:5]
+            self.reset_deck(excluded=self.hand + self.board)
+        else:
+            first_four = self.board[:4]
+            self.reset_deck(excluded=self.hand + first_four)
+            self.board = first_four + [self.deal_card()]
+        self.stage = "river"
+        return True
+
+    # ----------------------- Dealing -----------------------
+
+    def sampler(self):
+        """ComboSampler for the current hand_range, rebuilt when the range changes."""
+        if self._sampler is None or self._sampler.hand_range is not self.hand_range:
+            self._sampler = ComboSampler(self.hand_range)
+        return self._sampler
+
+    def generate_playable_hand(self):
+        if self.hand_range.weights is None:
+            c1, c2 = self.rng.choice(self.hand_range.pairs)
+        else:
+            c1, c2 = self.sampler().sample(self.rng, dead=0)
+        return [CARD_CODES[c1], CARD_CODES[c2]]
+
+    def deal_filtered_flop(self):
+        hero = [CARD_INDEX[c] for c in self.hand]
+        if self.iso_flops:
+            cards = random_class_flop(self.rng, hero, self.flop_textures)
+        else:
+            cards = flop_cards(random_matching_flop(self.rng, self.flop_textures, hero))
+        flop = [CARD_CODES[c] for c in cards]
+        self.rng.shuffle(flop)
+        return flop
+
+    def reset_deck(self, excluded=None):
+        # Only cards whose dead/live state changed are moved, so a street
+        # reroll costs O(cards dealt) rather than a fresh 52-card shuffle.
+        self.deck.reset(CARD_INDEX[c] for c in (excluded or []))
+
+    def deal_card(self):
+        if not len(self.deck):
+            self.reset_deck(excluded=self.hand + self.board)
+        return CARD_CODES[self.deck.deal()]
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Vectorized 7-card hand evaluator and Monte Carlo equity for RTP Drillz.
+
+Requires NumPy. Cards are ints 0-51 as in rtp_drillz_deck (rank index * 4 +
+suit index). evaluate7() scores a whole (N, 7) batch at once; higher scores
+win. Scores pack the hand category and five kicker ranks as
+category << 20 | r0 << 16 | r1 << 12 | r2 << 8 | r3 << 4 | r4.
+
+  result = hero_equity(["As", "Kd"], ["Qh", "Js", "2c"], iterations=20000)
+  result.equity  # 0.0 - 1.0, ties count half
+
+  # Against a compiled range, stopping early once the estimate is tight:
+  r = compile_range("QQ+, AK")
+  hero_equity(["As", "Kd"], ["Qh", "Js", "2c"], r.pairs, villain_weights=r.weights, target_stderr=0.005)
+"""
+
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from rtp_drillz_deck import CARD_INDEX
+from rtp_drillz_engine import PLAYABLE_COMBOS
+
+
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+
+_RANK_BITS = 1 << np.arange(13, dtype=np.int64)
+
+
+def _build_tables():
+    straight_high = np.full(8192, -1, dtype=np.int64)
+    high_bit = np.full(8192, 0, dtype=np.int64)
+    top5 = np.zeros(8192, dtype=np.int64)
+
+    windows = [(0b11111 << low, low + 4) for low in range(8, -1, -1)]
+    wheel = (1 << 12) | 0b1111  # A2345, 5-high
+
+    for mask in range(1, 8192):
+        ranks = [r for r in range(12, -1, -1) if mask >> r & 1]
+        high_bit[mask] = ranks[0]
+        packed = 0
+        for r in (ranks + [0] * 5)[:5]:
+            packed = packed << 4 | r
+        top5[mask] = packed
+        for window, high in windows:
+            if mask & window == window:
+                straight_high[mask] = high
+                break
+        else:
+            if mask & wheel == wheel:
+                straight_high[mask] = 3
+    return straight_high, high_bit, top5
+
+
+STRAIGHT_HIGH, HIGH_BIT, TOP5 = _build_tables()
+
+
+def evaluate7(cards):
+    """Score an (N, 7) int array of distinct cards; returns an (N,) int64 array."""
+    cards = np.asarray(cards, dtype=np.int64)
+    ranks = cards >> 2
+    suits = cards & 3
+    n = cards.shape[0]
+
+    counts = (ranks[:, :, None] == np.arange(13)).sum(axis=1)
+    rank_mask = (counts > 0) @ _RANK_BITS
+
+    suit_counts = (suits[:, :, None] == np.arange(4)).sum(axis=1)
+    flush_suit = suit_counts.argmax(axis=1)
+    has_flush = suit_counts.max(axis=1) >= 5
+    flush_mask = np.where(suits == flush_suit[:, None], 1 << ranks, 0).sum(axis=1)
+    flush_mask = np.where(has_flush, flush_mask, 0)
+
+    # Rank groups ordered by (count, rank) descending.
+    keys = -np.sort(-(counts * 16 + np.arange(13)), axis=1)[:, :5]
+    c = keys >> 4
+    r = keys & 15
+
+    sf_high = STRAIGHT_HIGH[flush_mask]
+    st_high = STRAIGHT_HIGH[rank_mask]
+    r0_bit = 1 << r[:, 0]
+    r1_bit = 1 << r[:, 1]
+
+    def pack(cat, *kickers):
+        value = np.full(n, cat << 20, dtype=np.int64)
+        for i, k in enumerate(kickers):
+            value |= k << (16 - 4 * i)
+        return value
+
+    conditions = [
+        has_flush & (sf_high >= 0),
+        c[:, 0] == 4,
+        (c[:, 0] == 3) & (c[:, 1] >= 2),
+        has_flush,
+        st_high >= 0,
+        c[:, 0] == 3,
+        (c[:, 0] == 2) & (c[:, 1] == 2),
+        c[:, 0] == 2,
+    ]
+    choices = [
+        pack(STRAIGHT_FLUSH, sf_high),
+        pack(QUADS, r[:, 0], HIGH_BIT[rank_mask & ~r0_bit]),
+        pack(FULL_HOUSE, r[:, 0], r[:, 1]),
+        (FLUSH << 20) | TOP5[flush_mask],
+        pack(STRAIGHT, st_high),
+        pack(TRIPS, r[:, 0], r[:, 1], r[:, 2]),
+        pack(TWO_PAIR, r[:, 0], r[:, 1], HIGH_BIT[rank_mask & ~r0_bit & ~r1_bit]),
+        pack(PAIR, r[:, 0], r[:, 1], r[:, 2], r[:, 3]),
+    ]
+    return np.select(conditions, choices, default=(HIGH_CARD << 20) | TOP5[rank_mask])
+
+
+class EquityResult(NamedTuple):
+    win: float
+    tie: float
+    lose: float
+    iterations: int
+    elapsed_ms: float
+
+    @property
+    def equity(self):
+        return self.win + self.tie / 2.0
+
+
+def hero_equity(hero, board, villain_combos=PLAYABLE_COMBOS, iterations=20000, rng=None,
+                villain_weights=None, target_stderr=None, batch=2000):
+    """
+    Monte Carlo equity of `hero` (two card codes) against a villain range on
+    `board` (0-5 card codes). `villain_combos` is a sequence of (card, card)
+    int pairs, weighted by `villain_weights` (same length) or uniformly when
+    None; combos blocked by hero or board are dropped.
+
+    Runs at most `iterations` trials. With `target_stderr`, trials run in
+    batches of `batch` and stop once the standard error of the equity
+    estimate is below it.
+    """
+    start = time.perf_counter()
+    rng = rng if rng is not None else np.random.default_rng()
+
+    known = [CARD_INDEX[c] for c in hero] + [CARD_INDEX[c] for c in board]
+    dead = 0
+    for card in known:
+        dead |= 1 << card
+
+    weights = villain_weights if villain_weights is not None else (1.0,) * len(villain_combos)
+    live_combos = [
+        (combo, weight)
+        for combo, weight in zip(villain_combos, weights)
+        if weight > 0 and not (dead >> combo[0] & 1 or dead >> combo[1] & 1)
+    ]
+    if not live_combos:
+        raise ValueError("Villain range is empty after removing blocked combos.")
+    combos = np.array([combo for combo, _ in live_combos], dtype=np.int64).reshape(-1, 2)
+    probs = None
+    if villain_weights is not None:
+        probs = np.array([weight for _, weight in live_combos], dtype=np.float64)
+        probs /= probs.sum()
+    live = np.array([c for c in range(52) if not dead >> c & 1], dtype=np.int64)
+
+    wins = ties = done = 0
+    step = iterations if target_stderr is None else min(batch, iterations)
+    while done < iterations:
+        n = min(step, iterations - done)
+        batch_wins, batch_ties = _play(known, len(board), combos, probs, live, n, rng)
+        wins += batch_wins
+        ties += batch_ties
+        done += n
+        if target_stderr is not None:
+            # Each trial scores 1, 0.5 or 0; stderr is sqrt(var / n).
+            mean = (wins + ties / 2.0) / done
+            variance = (wins + ties / 4.0) / done - mean * mean
+            if variance / done < target_stderr * target_stderr:
+                break
+
+    return EquityResult(
+        win=wins / done,
+        tie=ties / done,
+        lose=(done - wins - ties) / done,
+        iterations=done,
+        elapsed_ms=(time.perf_counter() - start) * 1000.0,
+    )
+
+
+def _play(known, board_len, combos, probs, live, iterations, rng):
+    """(wins, ties) for hero over `iterations` random villain hands and runouts."""
+    if probs is None:
+        villain = combos[rng.integers(len(combos), size=iterations)]
+    else:
+        villain = combos[rng.choice(len(combos), size=iterations, p=probs)]
+    missing = 5 - board_len
+    board_arr = np.broadcast_to(np.array(known[2:], dtype=np.int64), (iterations, board_len))
+
+    if missing:
+        # Pick missing + 2 random live cards per trial, then keep the first
+        # `missing` that do not collide with the villain's hand.
+        picks = np.argpartition(rng.random((iterations, len(live))), missing + 1, axis=1)[:, :missing + 2]
+        candidates = live[picks]
+        clash = (candidates == villain[:, :1]) | (candidates == villain[:, 1:])
+        order = np.argsort(clash, axis=1, kind="stable")[:, :missing]
+        runout = np.take_along_axis(candidates, order, axis=1)
+        full_board = np.concatenate([board_arr, runout], axis=1)
+    else:
+        full_board = board_arr
+
+    hero_arr = np.broadcast_to(np.array(known[:2], dtype=np.int64), (iterations, 2))
+    hero_score = evaluate7(np.concatenate([hero_arr, full_board], axis=1))
+    villain_score = evaluate7(np.concatenate([villain, full_board], axis=1))
+    return int((hero_score > villain_score).sum()), int((hero_score == villain_score).sum())
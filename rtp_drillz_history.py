@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Drill history store for RTP Drillz (SQLite, WAL mode).
+
+Every completed drill is one row in `drills`: hero hand and its preflop
+class, the five board cards, flop texture bits, spot tags and the decision
+time spent on each street. Flop textures are also written to
+`drill_textures` (texture, drill id), so per-texture lookups walk an index
+instead of scanning:
+
+  store = HistoryStore("rtp_history.sqlite3")
+  store.record(DrillRecord(hand=["As", "Kd"], board=[...], tags=("monotone",),
+                           decision_ms={"flop": 4200, "turn": 3100, "river": 5200}))
+  store.recent(texture="monotone", limit=500)
+  store.flag(record)             # mark that drill as a mistake
+  store.close()                  # flushes pending writes
+
+record() only enqueues; a writer thread commits rows in batches, one
+transaction per batch. Reads use their own connection and see committed
+rows immediately thanks to WAL.
+
+Query from the command line:
+  python3 rtp_drillz_history.py --texture monotone --limit 500
+"""
+
+import argparse
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import NamedTuple
+
+from rtp_drillz_deck import from_code
+from rtp_drillz_engine import STREET_STAGES, hand_class
+from rtp_drillz_textures import TEXTURE_BITS, TEXTURES, classify_flop
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(SCRIPT_DIR, "rtp_history.sqlite3")
+SCHEMA_VERSION = 2
+
+BATCH_SIZE = 256
+FLUSH_INTERVAL_S = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drills (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    hand TEXT NOT NULL,
+    hand_class TEXT NOT NULL,
+    board TEXT NOT NULL,
+    textures INTEGER NOT NULL,
+    tags TEXT NOT NULL DEFAULT '',
+    flop_ms INTEGER,
+    turn_ms INTEGER,
+    river_ms INTEGER,
+    timeouts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS drills_hand_class ON drills (hand_class, id);
+CREATE TABLE IF NOT EXISTS drill_textures (
+    texture TEXT NOT NULL,
+    drill_id INTEGER NOT NULL REFERENCES drills (id) ON DELETE CASCADE,
+    PRIMARY KEY (texture, drill_id)
+) WITHOUT ROWID;
+"""
+
+# Applied in order to databases older than the key's version.
+MIGRATIONS = {
+    2: """
+ALTER TABLE drills ADD COLUMN flagged INTEGER NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS drills_spot ON drills (hand, board);
+""",
+}
+
+ROW_COLUMNS = (
+    "id",
+    "played_at",
+    "hand",
+    "hand_class",
+    "board",
+    "textures",
+    "tags",
+    "flop_ms",
+    "turn_ms",
+    "river_ms",
+    "timeouts",
+    "flagged",
+)
+
+
+class DrillRecord(NamedTuple):
+    hand: list
+    board: list
+    tags: tuple = ()
+    decision_ms: dict | None = None
+    timeouts: int = 0
+    played_at: float = 0.0
+
+
+class _Flag(NamedTuple):
+    record: DrillRecord
+
+
+def connect(path, check_same_thread=True):
+    conn = sqlite3.connect(path, timeout=5.0, check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps commits durable across app crashes with NORMAL sync.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        _migrate(conn)
+    return conn
+
+
+def _migrate(conn):
+    # The writer and reader connections may both get here; BEGIN IMMEDIATE
+    # serializes them and the version is read again under the lock.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        scripts = [SCHEMA] if version < 1 else []
+        scripts += [MIGRATIONS[t] for t in sorted(MIGRATIONS) if version < t]
+        for script in scripts:
+            for statement in script.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+        conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def _row_values(record):
+    textures = classify_flop(*(from_code(c) for c in record.board[:3]))
+    times = record.decision_ms or {}
+    return (
+        record.played_at or time.time(),
+        "".join(record.hand),
+        hand_class(*record.hand),
+        "".join(record.board),
+        textures,
+        " ".join(record.tags),
+        *(times.get(stage) for stage in STREET_STAGES),
+        record.timeouts,
+    ), textures
+
+
+def write_records(conn, records):
+    """Insert `records` (and apply queued flags) in one transaction."""
+    with conn:
+        for record in records:
+            if isinstance(record, _Flag):
+                r = record.record
+                conn.execute(
+                    "UPDATE drills SET flagged = 1 WHERE played_at = ? AND hand = ? AND board = ?",
+                    (r.played_at, "".join(r.hand), "".join(r.board)),
+                )
+                continue
+            values, textures = _row_values(record)
+            drill_id = conn.execute(
+                "INSERT INTO drills (played_at, hand, hand_class, board, textures, tags,"
+                " flop_ms, turn_ms, river_ms, timeouts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                values,
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO drill_textures (texture, drill_id) VALUES (?, ?)",
+                [(name, drill_id) for name in TEXTURES if textures & TEXTURE_BITS[name]],
+            )
+
+
+class HistoryStore:
+    """Drill history with batched writes on a background thread."""
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL_S):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue()
+        self.errors = 0
+        self._reader = None
+        self._writer = threading.Thread(target=self._write_loop, name="rtp-history-writer", daemon=True)
+        self._writer.start()
+
+    # ----------------------- Writes -----------------------
+
+    def record(self, record):
+        """Queue a completed drill; never blocks on the database."""
+        if not record.played_at:
+            record = record._replace(played_at=time.time())
+        self.pending.put(record)
+        return record
+
+    def flag(self, record):
+        """Mark a drill returned by record() as a mistake."""
+        self.pending.put(_Flag(record))
+
+    def flush(self):
+        """Block until every record queued so far is committed."""
+        done = threading.Event()
+        self.pending.put(done)
+        done.wait()
+
+    def close(self):
+        self.pending.put(None)
+        self._writer.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _write_loop(self):
+        try:
+            conn = connect(self.path)
+        except sqlite3.Error as exc:
+            print(f"WARNING: drill history disabled: {exc}", file=sys.stderr)
+            conn = None
+
+        stop = False
+        while not stop:
+            batch, waiters = [], []
+            item = self.pending.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or waiters or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.pending.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if batch and conn is not None:
+                try:
+                    write_records(conn, batch)
+                except (sqlite3.Error, KeyError, ValueError) as exc:
+                    self.errors += len(batch)
+                    print(f"WARNING: could not save {len(batch)} drills: {exc}", file=sys.stderr)
+            for waiter in waiters:
+                waiter.set()
+
+        if conn is not None:
+            conn.close()
+
+    # ----------------------- Reads -----------------------
+
+    def reader(self):
+        # Used by one thread at a time (not necessarily the creator); the
+        # writer thread has its own connection.
+        if self._reader is None:
+            self._reader = connect(self.path, check_same_thread=False)
+            self._reader.row_factory = sqlite3.Row
+        return self._reader
+
+    def recent(self, texture=None, hand_class=None, limit=500):
+        """Newest drills first, optionally limited to a flop texture and/or hand class."""
+        if texture is not None and texture not in TEXTURE_BITS:
+            raise ValueError(f"Unknown flop texture: {texture!r}")
+
+        cols = ", ".join(f"d.{c}" for c in ROW_COLUMNS)
+        if texture is not None and hand_class is not None:
+            # One hand class is a small slice of the table; filter its rows by texture bit.
+            sql = (
+                f"SELECT {cols} FROM drills d WHERE d.hand_class = ? AND d.textures & ?"
+                " ORDER BY d.id DESC LIMIT ?"
+            )
+            args = [hand_class, TEXTURE_BITS[texture]]
+        elif texture is not None:
+            sql = (
+                f"SELECT {cols} FROM drill_textures t JOIN drills d ON d.id = t.drill_id"
+                " WHERE t.texture = ? ORDER BY t.drill_id DESC LIMIT ?"
+            )
+            args = [texture]
+        elif hand_class is not None:
+            sql = f"SELECT {cols} FROM drills d WHERE d.hand_class = ? ORDER BY d.id DESC LIMIT ?"
+            args = [hand_class]
+        else:
+            sql = f"SELECT {cols} FROM drills d ORDER BY d.id DESC LIMIT ?"
+            args = []
+        return self.reader().execute(sql, (*args, limit)).fetchall()
+
+    def spot_stats(self, slow_ms):
+        """
+        One row per distinct (hand, board): reviews, lapses (flagged, timed
+        out or slower than `slow_ms` in total), last_played, avg_ms and
+        last_lapse for the most recent drill of that spot.
+        """
+        total = "COALESCE(flop_ms, 0) + COALESCE(turn_ms, 0) + COALESCE(river_ms, 0)"
+        lapse = f"(flagged > 0 OR timeouts > 0 OR {total} > :slow)"
+        # SQLite takes bare columns (last_lapse) from the row holding MAX(played_at).
+        sql = (
+            f"SELECT hand, board, COUNT(*) AS reviews, SUM({lapse}) AS lapses,"
+            f" AVG({total}) AS avg_ms, MAX(played_at) AS last_played, {lapse} AS last_lapse"
+            " FROM drills GROUP BY hand, board"
+        )
+        return self.reader().execute(sql, {"slow": slow_ms})
+
+    def count(self):
+        return self.reader().execute("SELECT COUNT(*) FROM drills").fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the RTP Drillz drill history.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="History database path.")
+    parser.add_argument("--texture", choices=TEXTURES, help="Only drills whose flop has this texture.")
+    parser.add_argument("--hand-class", help="Only drills with this preflop class, e.g. AKs, T9o, QQ.")
+    parser.add_argument("--limit", type=int, default=20, help="Max rows to show (newest first).")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.db):
+        print(f"ERROR: no history database at {args.db}", file=sys.stderr)
+        return 1
+
+    store = HistoryStore(args.db)
+    try:
+        start = time.perf_counter()
+        rows = store.recent(args.texture, args.hand_class, args.limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for row in rows:
+            times = " ".join("-" if row[f"{s}_ms"] is None else f"{row[f'{s}_ms'] / 1000:.1f}s" for s in STREET_STAGES)
+            print(f"{row['id']:>8}  {row['hand']:<5} {row['hand_class']:<4} {row['board']:<11} {times}  {row['tags']}")
+        print(f"{len(rows)} of {store.count():,} drills ({elapsed_ms:.1f} ms)")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Suit-isomorphic flop canonicalization for RTP Drillz.
+
+Relabeling suits never changes a spot strategically, so the 22,100 flops
+collapse into 1,755 classes. The table is built once (by walking each
+orbit of the 24 suit permutations) and then maps a flop, or a flop plus
+hero hand, to its class in O(1):
+
+  flop_class((c1, c2, c3))            # 0 .. 1754
+  spot_key((c1, c2, c3), (h1, h2))    # int, equal for isomorphic spots
+  random_class_flop(rng, hero=(h1, h2), names=("monotone",))
+
+Cards are ints 0-51 as in rtp_drillz_deck; spot_key() works as a cache key
+for any per-spot computation.
+"""
+
+from array import array
+from functools import lru_cache
+from itertools import permutations
+
+from rtp_drillz_textures import MAX_REDRAWS, flop_blocked, flop_cards, flop_table, texture_mask
+
+
+SUIT_PERMS = tuple(permutations(range(4)))
+_INVERSE = tuple(SUIT_PERMS.index(tuple(p.index(s) for s in range(4))) for p in SUIT_PERMS)
+
+
+def _permute(card, perm):
+    return (card & ~3) | perm[card & 3]
+
+
+def _pack(a, b, c):
+    a, b, c = sorted((a, b, c))
+    return a | b << 6 | c << 12
+
+
+@lru_cache(maxsize=None)
+def iso_table():
+    """
+    Return (position, classes, perms, leaders):
+      position[packed flop] -> flop index in flop_table() order
+      classes[flop index]   -> class id
+      perms[flop index]     -> bit set of SUIT_PERMS indices mapping the flop
+                               onto its class leader
+      leaders[class id]     -> packed canonical flop
+    """
+    flops, _ = flop_table()
+    position = {packed: i for i, packed in enumerate(flops)}
+    classes = array("H", [0xFFFF]) * len(flops)
+    perms = array("I", [0]) * len(flops)
+    leaders = array("I")
+
+    for i, packed in enumerate(flops):
+        if classes[i] != 0xFFFF:
+            continue
+        class_id = len(leaders)
+        leaders.append(packed)
+        cards = flop_cards(packed)
+        for p_index, perm in enumerate(SUIT_PERMS):
+            member = position[_pack(*(_permute(c, perm) for c in cards))]
+            classes[member] = class_id
+            perms[member] |= 1 << _INVERSE[p_index]
+
+    return position, classes, perms, leaders
+
+
+def class_count():
+    return len(iso_table()[3])
+
+
+def flop_class(flop):
+    """Class id of a flop given as three card ints in any order."""
+    position, classes, _, _ = iso_table()
+    return classes[position[_pack(*flop)]]
+
+
+def canonical_flop(flop):
+    """The class leader (three sorted card ints) isomorphic to `flop`."""
+    return flop_cards(iso_table()[3][flop_class(flop)])
+
+
+def spot_key(flop, hero):
+    """
+    Int key shared by every suit relabeling of (flop, hero). Only the
+    permutations that canonicalize the flop are tried, so this is O(1).
+    """
+    position, classes, perms, _ = iso_table()
+    i = position[_pack(*flop)]
+    bits = perms[i]
+    h1, h2 = hero
+    best = None
+    p_index = 0
+    while bits:
+        if bits & 1:
+            perm = SUIT_PERMS[p_index]
+            a, b = _permute(h1, perm), _permute(h2, perm)
+            pair = (a << 6 | b) if a < b else (b << 6 | a)
+            if best is None or pair < best:
+                best = pair
+        bits >>= 1
+        p_index += 1
+    return classes[i] << 12 | best
+
+
+@lru_cache(maxsize=None)
+def _class_members(class_id):
+    position, classes, _, leaders = iso_table()
+    cards = flop_cards(leaders[class_id])
+    return tuple(sorted({_pack(*(_permute(c, perm) for c in cards)) for perm in SUIT_PERMS}))
+
+
+@lru_cache(maxsize=None)
+def _texture_classes(mask):
+    _, textures = flop_table()
+    position, _, _, leaders = iso_table()
+    # Textures are suit-invariant, so the leader speaks for its class.
+    return array("H", (i for i, leader in enumerate(leaders) if textures[position[leader]] & mask == mask))
+
+
+def random_class_flop(rng, hero=(), names=()):
+    """
+    Draw a flop uniformly over isomorphism classes (optionally limited to
+    textures in `names`) that have a member avoiding the hero cards, then
+    a random such member. Classes come from a per-texture list and a class
+    fully blocked by the hero is redrawn, so a draw is O(1) expected.
+    Returns three card ints.
+    """
+    dead = 0
+    for card in hero:
+        dead |= 1 << card
+    class_ids = _texture_classes(texture_mask(names))
+    if not class_ids:
+        raise ValueError(f"No flop classes match textures {', '.join(names)}.")
+    for _ in range(MAX_REDRAWS):
+        members = [m for m in _class_members(rng.choice(class_ids)) if not flop_blocked(m, dead)]
+        if members:
+            return flop_cards(rng.choice(members))
+    # The hero blocks most of a tiny class list; filter it once.
+    live = [i for i in class_ids if any(not flop_blocked(m, dead) for m in _class_members(i))]
+    if not live:
+        raise ValueError(f"No flop classes match textures {', '.join(names)} with those hero cards.")
+    members = [m for m in _class_members(rng.choice(live)) if not flop_blocked(m, dead)]
+    return flop_cards(rng.choice(members))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Span profiler for the RTP Drillz desktop app (rtp_drillz.py --profile).
+
+instrument() replaces methods on one object with timing wrappers, so
+nothing is paid when profiling is off. Each call appends a (name,
+category, thread, start, duration) tuple; nested calls become nested
+spans in the trace:
+
+  profiler = Profiler()
+  profiler.instrument(app, ("keep_flop", "new_flop"), "action")
+  profiler.instrument(app.engine, ("reset_deck",), "engine")
+  ...
+  profiler.write_trace("rtp_drillz_trace.json")   # chrome://tracing or ui.perfetto.dev
+  print(profiler.summary())                       # p50/p95 per span name
+
+Spans from worker threads (e.g. image preload) land on their own track.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+
+class Profiler:
+    """Collects complete ("X") spans and exports them as Chrome trace JSON."""
+
+    def __init__(self):
+        self.spans = []
+        self.thread_names = {}
+        self.origin_ns = time.perf_counter_ns()
+
+    def wrap(self, fn, name, category):
+        spans = self.spans
+        clock = time.perf_counter_ns
+        get_ident = threading.get_ident
+        thread_names = self.thread_names
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tid = get_ident()
+                if tid not in thread_names:
+                    thread_names[tid] = threading.current_thread().name
+                # list.append is atomic, so worker threads can record too.
+                spans.append((name, category, tid, start, clock() - start))
+
+        return timed
+
+    def instrument(self, obj, method_names, category):
+        for method in method_names:
+            setattr(obj, method, self.wrap(getattr(obj, method), method, category))
+
+    def trace(self):
+        pid = os.getpid()
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self.thread_names.items()
+        ]
+        for name, category, tid, start, duration in list(self.spans):
+            events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "pid": pid,
+                "tid": tid,
+                "ts": (start - self.origin_ns) / 1000.0,
+                "dur": duration / 1000.0,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.trace(), f, separators=(",", ":"))
+
+    def summary(self):
+        """Calls, p50, p95 and max in ms per span name, grouped by category."""
+        by_name = {}
+        for name, category, _, _, duration in list(self.spans):
+            by_name.setdefault((category, name), []).append(duration / 1e6)
+        if not by_name:
+            return "Profile: no spans recorded."
+        lines = [f"{'category':<8} {'span':<22} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"]
+        for (category, name), times in sorted(by_name.items()):
+            times.sort()
+            p50 = times[len(times) // 2]
+            p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+            lines.append(f"{category:<8} {name:<22} {len(times):>6} {p50:>8.2f} {p95:>8.2f} {times[-1]:>8.2f}")
+        return "\n".join(lines)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Preflop range notation for RTP Drillz.
+
+A range string such as "TT+, A2s+, KJo, 65s-54s, AsKd" compiles to a
+1326-bit int with one bit per two-card combo, plus its combo ids and
+(high, low) card pairs for O(1) sampling. Compiled ranges are memoized by
+their text:
+
+  r = compile_range("TT+, AQs+, AKo")
+  in_range(r.mask, c1, c2)          # O(1) membership on card ints
+  c1, c2 = rng.choice(r.pairs)
+
+Supported tokens (comma separated):
+  AA  TT+  99-66            pairs, pairs and better, pair span
+  AKs  AKo  AK              suited, offsuit, both
+  A2s+  KTo+                kicker up to one below the top card
+  A5s-A2s  65s-54s          kicker span, or connectors stepping down together
+  AsKd                      one exact combo
+  AKo:0.5                   any token with a frequency; later tokens win
+
+Ranges with frequencies keep them in `weights` (aligned with `combos`);
+sample those with rtp_drillz_sampler.ComboSampler.
+
+Cards are ints 0-51 as in rtp_drillz_deck. Combo ids follow ALL_COMBOS.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from rtp_drillz_deck import RANKS
+
+
+# All 1326 two-card combos as (high, low) int pairs. The higher card id
+# always has the higher (or equal) rank, so each pair is in display order.
+ALL_COMBOS = tuple((b, a) for a in range(52) for b in range(a + 1, 52))
+
+# COMBO_ID[c1 * 52 + c2] -> index into ALL_COMBOS, for either card order.
+COMBO_ID = [-1] * (52 * 52)
+for _i, (_hi, _lo) in enumerate(ALL_COMBOS):
+    COMBO_ID[_hi * 52 + _lo] = _i
+    COMBO_ID[_lo * 52 + _hi] = _i
+
+
+# Default range per (spot type, position). PLAYABLE_RANGE is the wide
+# drill range used when no spot is selected.
+PLAYABLE_RANGE = (
+    "22+, A2s+, K2s+, Q2s+, J2s+, T2s+, 92s+, 82s+, 72s+, 62s+, 52s+, 42s+, 32s, "
+    "A7o+, K9o+, Q9o+, J8o+, T7o+, 98o, 87o"
+)
+SPOT_TYPES = ("SRP", "3BP", "4BP")
+POSITIONS = ("IP", "OOP")
+SPOT_RANGES = {
+    ("SRP", "IP"): "22+, A2s+, K5s+, Q8s+, J8s+, T7s+, 97s+, 86s+, 75s+, 64s+, 54s, A8o+, KTo+, QTo+, JTo",
+    ("SRP", "OOP"): (
+        "22-99, A2s-AJs, K2s-KJs, Q4s-QJs, J6s+, T6s+, 96s+, 85s+, 74s+, 63s+, 53s+, 43s, "
+        "A2o-AJo, K8o-KJo, Q9o+, J9o+, T8o+, 98o, 87o"
+    ),
+    ("3BP", "IP"): "TT+, AJs+, KQs, A5s-A4s, AKo, 76s, 65s",
+    ("3BP", "OOP"): "22-JJ, A2s-AQs, K9s+, Q9s+, J9s+, T8s+, 97s+, 86s+, 75s+, 65s, 54s, AJo-AQo, KQo",
+    ("4BP", "IP"): "JJ-QQ, AQs, AKo, A5s",
+    ("4BP", "OOP"): "QQ+, AKs, AKo, A5s",
+}
+
+
+class HandRange(NamedTuple):
+    text: str
+    mask: int
+    combos: tuple
+    pairs: tuple
+    weights: tuple | None = None
+
+
+def combo_id(c1, c2):
+    return COMBO_ID[c1 * 52 + c2]
+
+
+def in_range(mask, c1, c2):
+    return mask >> COMBO_ID[c1 * 52 + c2] & 1 == 1
+
+
+def _card(rank, suit):
+    return rank * 4 + suit
+
+
+def _rank(ch):
+    index = RANKS.find(ch.upper())
+    if index < 0:
+        raise ValueError(f"Unknown rank: {ch!r}")
+    return index
+
+
+def _class_mask(high, low, kind):
+    """Mask of every combo of ranks (high, low); kind is 's', 'o' or ''."""
+    mask = 0
+    for s1 in range(4):
+        for s2 in range(4):
+            if high == low and s2 <= s1:
+                continue
+            suited = s1 == s2
+            if kind == "s" and not suited or kind == "o" and suited:
+                continue
+            mask |= 1 << COMBO_ID[_card(high, s1) * 52 + _card(low, s2)]
+    return mask
+
+
+def _parse_class(text):
+    """'AKs' -> (12, 11, 's'); 'TT' -> (8, 8, '')."""
+    if len(text) not in (2, 3):
+        raise ValueError
+    high, low = _rank(text[0]), _rank(text[1])
+    kind = text[2].lower() if len(text) == 3 else ""
+    if kind not in ("", "s", "o") or (high == low and kind):
+        raise ValueError
+    if low > high:
+        high, low = low, high
+    return high, low, kind
+
+
+def _parse_token(token):
+    if len(token) == 4 and token[1].lower() in "shdc" and token[3].lower() in "shdc":
+        c1 = _card(_rank(token[0]), "shdc".index(token[1].lower()))
+        c2 = _card(_rank(token[2]), "shdc".index(token[3].lower()))
+        if c1 == c2:
+            raise ValueError
+        return 1 << COMBO_ID[c1 * 52 + c2]
+
+    if token.endswith("+"):
+        high, low, kind = _parse_class(token[:-1])
+        if high == low:
+            return _span(high, low, kind, 12, 12)
+        return _span(high, low, kind, high, high - 1)
+
+    if "-" in token:
+        first, last = token.split("-", 1)
+        h1, l1, kind = _parse_class(first)
+        h2, l2, kind2 = _parse_class(last)
+        if kind != kind2:
+            raise ValueError
+        if (h1 - l1) == (h2 - l2):
+            # Pairs (gap 0) or connectors: both cards step together.
+            return _span(min(h1, h2), min(l1, l2), kind, max(h1, h2), max(l1, l2))
+        if h1 == h2:
+            return _span(h1, min(l1, l2), kind, h1, max(l1, l2))
+        raise ValueError
+
+    high, low, kind = _parse_class(token)
+    return _class_mask(high, low, kind)
+
+
+def _span(high, low, kind, top_high, top_low):
+    """Union of classes from (high, low) up to (top_high, top_low), stepping both ranks as needed."""
+    mask = 0
+    step_high = 1 if top_high != high else 0
+    while low <= top_low:
+        mask |= _class_mask(high, low, kind)
+        high += step_high
+        low += 1
+    return mask
+
+
+@lru_cache(maxsize=None)
+def compile_range(text):
+    """Compile a range string; raises ValueError naming the bad token."""
+    freq = {}
+    for token in "".join(text.split()).split(","):
+        if not token:
+            continue
+        try:
+            hands, _, weight = token.partition(":")
+            weight = float(weight) if weight else 1.0
+            if not 0.0 <= weight <= 1.0:
+                raise ValueError
+            token_mask = _parse_token(hands)
+        except ValueError:
+            raise ValueError(f"Bad range token: {token!r}") from None
+        while token_mask:
+            low_bit = token_mask & -token_mask
+            freq[low_bit.bit_length() - 1] = weight
+            token_mask ^= low_bit
+
+    combos = tuple(sorted(i for i, w in freq.items() if w > 0))
+    mask = 0
+    for i in combos:
+        mask |= 1 << i
+    weights = tuple(freq[i] for i in combos)
+    if all(w == 1.0 for w in weights):
+        weights = None
+    return HandRange(text, mask, combos, tuple(ALL_COMBOS[i] for i in combos), weights)
+
+
+def spot_range(spot_type=None, position=None):
+    """Compiled range for a spot, falling back to PLAYABLE_RANGE when unset or unknown."""
+    return compile_range(SPOT_RANGES.get((spot_type, position), PLAYABLE_RANGE))
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Spaced-repetition scheduler for RTP Drillz spots.
+
+A spot is (hero hand, board) as stored in the drill history, e.g.
+("AsKd", "Qh7c2d5s9h"). Each spot has a due time: a clean drill doubles
+its review interval, a lapse (flagged mistake, timer expiry or a slow
+decision) brings it back after LAPSE_RETRY_S. Among spots that are due,
+the ones with the most lapses and slowest decisions come first.
+
+Spots wait in a heap ordered by due time and move to a second heap ordered
+by priority once due; stale entries are skipped lazily through a version
+map, so next_spot() and review() are O(log n):
+
+  scheduler = ReviewScheduler()
+  scheduler.load(store.spot_stats(scheduler.slow_ms))
+  key = scheduler.next_spot()            # None when nothing is due
+  scheduler.review(key, decision_ms=9500, lapse=False)
+  scheduler.flag(key)                    # the last drill was a mistake
+"""
+
+import heapq
+import time
+from itertools import count
+from typing import NamedTuple
+
+
+REVIEW_BASE_S = 10 * 60
+MAX_INTERVAL_S = 30 * 24 * 60 * 60
+LAPSE_RETRY_S = 60
+# A spot handed out by next_spot() is held back this long unless reviewed.
+IN_FLIGHT_S = 5 * 60
+# Total decision time over flop, turn and river that counts as a lapse.
+SLOW_DRILL_MS = 30_000
+
+
+class SpotStats(NamedTuple):
+    reviews: int
+    lapses: int
+    avg_ms: float
+    last_played: float
+    last_lapse: bool
+
+
+def split_cards(text):
+    """'AsKd' -> ['As', 'Kd']."""
+    return [text[i:i + 2] for i in range(0, len(text), 2)]
+
+
+class ReviewScheduler:
+    """Due-time heap feeding a priority heap of spots to replay."""
+
+    def __init__(self, slow_ms=SLOW_DRILL_MS):
+        self.slow_ms = slow_ms
+        self.stats = {}
+        self.version = {}
+        self.waiting = []  # (due, seq, key)
+        self.ready = []    # (-priority, seq, key)
+        self.due = set()   # keys whose live entry is in `ready`
+        self._seq = count()
+
+    def __len__(self):
+        return len(self.stats)
+
+    # ----------------------- Scheduling -----------------------
+
+    def interval(self, stats):
+        if stats.last_lapse:
+            return LAPSE_RETRY_S
+        clean = stats.reviews - 2 * stats.lapses
+        return min(MAX_INTERVAL_S, REVIEW_BASE_S * 2 ** max(0, min(clean, 20)))
+
+    def priority(self, stats):
+        lapse_rate = stats.lapses / stats.reviews if stats.reviews else 0.0
+        return 2.0 * lapse_rate + min(stats.avg_ms / self.slow_ms, 2.0)
+
+    def load(self, rows):
+        """Replace all spots from spot_stats() rows in O(n)."""
+        self.stats.clear()
+        self.version.clear()
+        self.ready = []
+        self.due.clear()
+        waiting = []
+        for row in rows:
+            key = (row["hand"], row["board"])
+            stats = SpotStats(
+                row["reviews"],
+                row["lapses"] or 0,
+                row["avg_ms"] or 0.0,
+                row["last_played"],
+                bool(row["last_lapse"]),
+            )
+            seq = next(self._seq)
+            self.stats[key] = stats
+            self.version[key] = seq
+            waiting.append((stats.last_played + self.interval(stats), seq, key))
+        heapq.heapify(waiting)
+        self.waiting = waiting
+
+    def _schedule(self, key, due):
+        seq = next(self._seq)
+        self.version[key] = seq
+        self.due.discard(key)
+        heapq.heappush(self.waiting, (due, seq, key))
+
+    def _promote(self, now):
+        while self.waiting and self.waiting[0][0] <= now:
+            _, seq, key = heapq.heappop(self.waiting)
+            if self.version.get(key) == seq:
+                heapq.heappush(self.ready, (-self.priority(self.stats[key]), seq, key))
+                self.due.add(key)
+
+    def next_spot(self, now=None):
+        """Highest-priority due spot, or None. It is held back IN_FLIGHT_S until reviewed."""
+        now = time.time() if now is None else now
+        self._promote(now)
+        while self.ready:
+            _, seq, key = heapq.heappop(self.ready)
+            if self.version.get(key) != seq:
+                continue
+            self._schedule(key, now + IN_FLIGHT_S)
+            return key
+        return None
+
+    def review(self, key, decision_ms, lapse, played_at=None):
+        """Record a finished drill of `key` and reschedule it."""
+        played_at = time.time() if played_at is None else played_at
+        lapse = lapse or decision_ms > self.slow_ms
+        old = self.stats.get(key)
+        if old is None:
+            stats = SpotStats(1, int(lapse), float(decision_ms), played_at, lapse)
+        else:
+            reviews = old.reviews + 1
+            stats = SpotStats(
+                reviews,
+                old.lapses + int(lapse),
+                old.avg_ms + (decision_ms - old.avg_ms) / reviews,
+                played_at,
+                lapse,
+            )
+        self.stats[key] = stats
+        self._schedule(key, played_at + self.interval(stats))
+
+    def flag(self, key, now=None):
+        """Turn the last review of `key` into a lapse."""
+        stats = self.stats.get(key)
+        if stats is None or stats.last_lapse:
+            return
+        now = time.time() if now is None else now
+        stats = stats._replace(lapses=stats.lapses + 1, last_lapse=True)
+        self.stats[key] = stats
+        self._schedule(key, now + self.interval(stats))
+
+    def due_count(self, now=None):
+        """Number of spots due now."""
+        now = time.time() if now is None else now
+        self._promote(now)
+        return len(self.due)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Weighted hero-hand sampling for RTP Drillz.
+
+ComboSampler draws combos from a compiled range in proportion to their
+frequencies (AKo:0.5 etc.) using a Walker alias table, so each draw is
+O(1). Dead cards (a fixed or partial board, villain cards) are applied
+per draw or with set_dead():
+
+  sampler = ComboSampler(compile_range("QQ+, AKs, AKo:0.5"))
+  c1, c2 = sampler.sample(rng, dead=cards_mask(board))
+
+set_dead() only touches combos holding a card whose state changed and
+keeps a running live weight. While most of the range's weight is live,
+draws reject blocked combos from the full table (O(1) expected); when
+blockers remove more than `1 - min_live` of it, an exact table for the
+live combos is built once per dead mask and kept in a small LRU.
+"""
+
+from collections import OrderedDict
+
+
+class AliasTable:
+    """Walker/Vose alias table over non-negative weights."""
+
+    def __init__(self, weights):
+        n = len(weights)
+        if not n:
+            raise ValueError("Alias table needs at least one weight.")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("Alias table needs a positive total weight.")
+
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large[-1]
+            self.prob[s] = scaled[s]
+            self.alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            if scaled[g] < 1.0:
+                small.append(large.pop())
+        # Leftovers are 1.0 up to rounding.
+        self.n = n
+
+    def sample(self, rng):
+        u = rng.random() * self.n
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+
+class ComboSampler:
+    """Frequency-weighted combo draws from a HandRange with blocked cards."""
+
+    EXACT_CACHE_SIZE = 64
+
+    def __init__(self, hand_range, min_live=0.5):
+        self.hand_range = hand_range
+        self.pairs = hand_range.pairs
+        self.weights = hand_range.weights or (1.0,) * len(self.pairs)
+        if not self.pairs:
+            raise ValueError("Range has no combos.")
+        self.total = float(sum(self.weights))
+        self.min_live = min_live
+        self.base = AliasTable(self.weights)
+
+        # by_card[c] -> positions of combos holding card c.
+        self.by_card = [[] for _ in range(52)]
+        for j, (c1, c2) in enumerate(self.pairs):
+            self.by_card[c1].append(j)
+            self.by_card[c2].append(j)
+
+        self.dead = 0
+        self.blockers = [0] * len(self.pairs)
+        self.blocked_weight = 0.0
+        self.live_count = len(self.pairs)
+        self._exact = OrderedDict()
+
+    def set_dead(self, mask):
+        """Make exactly the cards in `mask` unavailable; O(changed cards * 51)."""
+        changed = mask ^ self.dead
+        while changed:
+            bit = changed & -changed
+            card = bit.bit_length() - 1
+            changed ^= bit
+            step = 1 if mask & bit else -1
+            for j in self.by_card[card]:
+                before = self.blockers[j]
+                self.blockers[j] = before + step
+                if before == 0:
+                    self.blocked_weight += self.weights[j]
+                    self.live_count -= 1
+                elif before + step == 0:
+                    self.blocked_weight -= self.weights[j]
+                    self.live_count += 1
+        self.dead = mask
+        if self.live_count == len(self.pairs):
+            self.blocked_weight = 0.0  # drop float drift once nothing is blocked
+
+    def live_fraction(self):
+        return max(0.0, self.total - self.blocked_weight) / self.total
+
+    def sample(self, rng, dead=None):
+        """A (high, low) card pair avoiding the dead cards (or `dead`, when given)."""
+        if dead is not None and dead != self.dead:
+            self.set_dead(dead)
+        if not self.live_count:
+            raise ValueError("No combos in range avoid the dead cards.")
+        if self.live_fraction() >= self.min_live:
+            while True:
+                j = self.base.sample(rng)
+                if not self.blockers[j]:
+                    return self.pairs[j]
+        live, table = self._exact_table()
+        return self.pairs[live[table.sample(rng)]]
+
+    def _exact_table(self):
+        entry = self._exact.get(self.dead)
+        if entry is not None:
+            self._exact.move_to_end(self.dead)
+            return entry
+        live = [j for j, b in enumerate(self.blockers) if not b]
+        entry = (live, AliasTable([self.weights[j] for j in live]))
+        self._exact[self.dead] = entry
+        if len(self._exact) > self.EXACT_CACHE_SIZE:
+            self._exact.popitem(last=False)
+        return entry
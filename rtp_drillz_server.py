@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Group study server for RTP Drillz (asyncio HTTP + WebSocket, stdlib only).
+
+One coach deals and advances streets; every connected player sees the same
+hand, board and street timer on their own screen:
+
+  python3 rtp_drillz_server.py --host 0.0.0.0 --port 8765 --timer 30
+
+The coach opens the URL printed at startup (it carries the coach token);
+players open http://HOST:PORT/. Routes:
+
+  GET /          minimal drill page (text cards, countdown, coach buttons)
+  GET /state     current drill state as JSON
+  GET /ws        WebSocket: state pushes to everyone, actions from the coach
+
+Coach messages are {"action": "deal" | "keep_hand" | "new_flop" |
+"keep_flop" | "new_turn" | "keep_turn" | "new_river" | "keep_river"} and
+{"action": "timer", "seconds": 30}. The server pushes {"type": "state",
+...} after every change and {"type": "time_up", ...} when a street timer
+runs out; "remaining_ms" lets clients run the countdown locally and
+"actions" lists the coach actions valid at the current stage. An action
+that is not valid now, or cannot be dealt, gets {"type": "error",
+"message": ...} back on the coach's socket and changes nothing.
+
+Deals come from a pool of spots (hand + full board) generated ahead of
+time on a worker thread and refilled below a low-water mark, so a deal is
+a pop and one broadcast regardless of range or flop filters. Each state is
+encoded into a WebSocket frame once and written to every client; a client
+whose unsent output grows past MAX_CLIENT_BUFFER is dropped instead of
+slowing the rest. benchmarks/bench_server.py load-tests it over loopback.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import secrets
+import sys
+import time
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+
+from rtp_drillz_engine import STREET_STAGES, DrillEngine
+from rtp_drillz_ranges import PLAYABLE_RANGE, compile_range
+from rtp_drillz_textures import TEXTURES, matching_flops
+
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_CONT, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+MAX_FRAME = 64 * 1024
+MAX_HEADER_BYTES = 8 * 1024
+MAX_CLIENT_BUFFER = 256 * 1024
+
+POOL_SIZE = 2048
+POOL_LOW_WATER = 512
+POOL_BATCH = 256
+
+ACTIONS = ("deal", "keep_hand", "new_flop", "keep_flop", "new_turn", "keep_turn", "new_river", "keep_river")
+# Coach actions per stage, mirroring the DrillEngine transitions (for the buttons).
+STAGE_ACTIONS = {
+    "start": ("deal",),
+    "hand": ("deal", "keep_hand"),
+    "flop": ("deal", "new_flop", "keep_flop"),
+    "turn": ("deal", "new_turn", "keep_turn"),
+    "river": ("deal", "new_river", "keep_river"),
+    "done": ("deal", "new_river"),
+}
+
+
+# ----------------------- WebSocket framing -----------------------
+
+
+class FrameError(ValueError):
+    """A frame we refuse; `code` is the close status to send (RFC 6455 section 7.4.1)."""
+
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.code = code
+
+
+def ws_accept_key(key):
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode("ascii")).digest()).decode("ascii")
+
+
+def _mask(payload, key):
+    # XOR as one big int instead of per byte.
+    n = len(payload)
+    repeated = (key * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(n, "big")
+
+
+def encode_frame(payload, opcode=OP_TEXT, mask=False):
+    """One final frame. Clients must mask (mask=True); servers must not."""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    n = len(payload)
+    head = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if n < 126:
+        head.append(mask_bit | n)
+    elif n < 1 << 16:
+        head.append(mask_bit | 126)
+        head += n.to_bytes(2, "big")
+    else:
+        head.append(mask_bit | 127)
+        head += n.to_bytes(8, "big")
+    if mask:
+        key = os.urandom(4)
+        return bytes(head) + key + _mask(payload, key)
+    return bytes(head) + payload
+
+
+async def read_frame(reader, require_mask=False):
+    """(opcode, payload) of the next frame; raises FrameError on frames we do not accept.
+
+    Servers pass require_mask=True: every client frame must be masked.
+    """
+    b0, b1 = await reader.readexactly(2)
+    if not b0 & 0x80 or b0 & 0x0F == OP_CONT:
+        raise FrameError("fragmented frames are not supported", 1003)
+    if require_mask and not b1 & 0x80:
+        raise FrameError("client frame is not masked", 1002)
+    n = b1 & 0x7F
+    if n == 126:
+        n = int.from_bytes(await reader.readexactly(2), "big")
+    elif n == 127:
+        n = int.from_bytes(await reader.readexactly(8), "big")
+    if n > MAX_FRAME:
+        raise FrameError("frame too large", 1009)
+    key = await reader.readexactly(4) if b1 & 0x80 else None
+    payload = await reader.readexactly(n)
+    if key is not None and n:
+        payload = _mask(payload, key)
+    return b0 & 0x0F, payload
+
+
+async def read_http_head(reader):
+    """(method, target, headers) with lower-cased header names."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    if len(head) > MAX_HEADER_BYTES:
+        raise ValueError("request header too large")
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+# ----------------------- Spot pool -----------------------
+
+
+class SpotPool:
+    """Pre-dealt (hand, board) spots, refilled on a worker thread."""
+
+    def __init__(self, hand_range=PLAYABLE_RANGE, flop_textures=(), iso_flops=False, seed=None,
+                 size=POOL_SIZE, low_water=POOL_LOW_WATER):
+        self.engine = DrillEngine(
+            rng=random.Random(seed),
+            flop_textures=flop_textures,
+            iso_flops=iso_flops,
+            hand_range=compile_range(hand_range),
+        )
+        self.size = size
+        self.low_water = low_water
+        self.spots = deque()
+        self.refill_task = None
+        self.refilled = asyncio.Event()
+        self.misses = 0
+
+    def generate(self, n):
+        # Only the refill task calls this, one batch at a time, on an
+        # executor thread; the event loop never touches self.engine.
+        engine = self.engine
+        out = []
+        for _ in range(n):
+            engine.deal_hand()
+            engine.keep_hand()
+            engine.keep_flop()
+            engine.keep_turn()
+            out.append((tuple(engine.hand), tuple(engine.board)))
+        return out
+
+    async def fill(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while len(self.spots) < self.size:
+                batch = await loop.run_in_executor(None, self.generate, min(POOL_BATCH, self.size - len(self.spots)))
+                self.spots.extend(batch)
+                self.refilled.set()
+        finally:
+            # Also wakes take() when the refill failed.
+            self.refilled.set()
+
+    def refill(self):
+        if self.refill_task is None or self.refill_task.done():
+            self.refill_task = asyncio.ensure_future(self.fill())
+
+    async def take(self):
+        """Next spot. If the pool ran dry, wait for the refill worker without blocking the loop."""
+        if not self.spots:
+            self.misses += 1
+            while not self.spots:
+                self.refill()
+                self.refilled.clear()
+                await self.refilled.wait()
+                task = self.refill_task
+                if not self.spots and task.done() and not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        spot = self.spots.popleft()
+        if len(self.spots) < self.low_water:
+            self.refill()
+        return spot
+
+
+# ----------------------- Drill room -----------------------
+
+
+class DrillRoom:
+    """One shared drill: the coach drives a DrillEngine, every client sees its state."""
+
+    def __init__(self, pool, timer_seconds=0, coach_token=None):
+        self.pool = pool
+        # Street rerolls are dealt live, with the same filters as the pool.
+        self.engine = DrillEngine(
+            rng=random.Random(),
+            flop_textures=pool.engine.flop_textures,
+            iso_flops=pool.engine.iso_flops,
+            hand_range=pool.engine.hand_range,
+        )
+        self.timer_seconds = timer_seconds
+        self.coach_token = coach_token or secrets.token_urlsafe(12)
+        self.clients = set()       # StreamWriters of open WebSockets
+        self.seq = 0
+        self.deadline = None      # loop.time() when the street timer ends
+        self.timer_handle = None
+        self.dropped = 0
+
+    # Messages
+
+    def state(self):
+        loop = asyncio.get_running_loop()
+        remaining = None
+        if self.deadline is not None:
+            remaining = max(0, round((self.deadline - loop.time()) * 1000))
+        return {
+            "type": "state",
+            "seq": self.seq,
+            "stage": self.engine.stage,
+            "hand": self.engine.hand,
+            "board": self.engine.board,
+            "actions": STAGE_ACTIONS[self.engine.stage],
+            "timer_seconds": self.timer_seconds,
+            "remaining_ms": remaining,
+            "clients": len(self.clients),
+            "sent_at": time.time(),
+        }
+
+    def broadcast(self, message):
+        frame = encode_frame(json.dumps(message, separators=(",", ":")))
+        for client in list(self.clients):
+            self.send_frame(client, frame)
+
+    def send_frame(self, writer, frame):
+        transport = writer.transport
+        if transport.is_closing():
+            self.clients.discard(writer)
+            return
+        if transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+            # Too slow to keep up; it can reconnect and get a fresh state.
+            self.dropped += 1
+            self.clients.discard(writer)
+            transport.abort()
+            return
+        writer.write(frame)
+
+    # Actions
+
+    async def apply(self, action, message):
+        engine = self.engine
+        if action == "timer":
+            seconds = message.get("seconds")
+            if not isinstance(seconds, int) or not 0 <= seconds <= 3600:
+                return False
+            self.timer_seconds = seconds
+            changed = True
+        elif action == "deal":
+            hand, board = await self.pool.take()
+            changed = engine.deal_spot(hand, board)
+        elif action in ACTIONS:
+            changed = getattr(engine, action)()
+            if not changed:
+                # e.g. a stray Keep Hand at river; the shared drill stays as it is.
+                raise ValueError(f"{action} is not valid at the {engine.stage} stage.")
+        else:
+            return False
+        if changed:
+            self.seq += 1
+            self._restart_timer()
+            self.broadcast(self.state())
+        return changed
+
+    def _restart_timer(self):
+        if self.timer_handle is not None:
+            self.timer_handle.cancel()
+            self.timer_handle = None
+        self.deadline = None
+        if self.timer_seconds and self.engine.stage in STREET_STAGES:
+            loop = asyncio.get_running_loop()
+            self.deadline = loop.time() + self.timer_seconds
+            self.timer_handle = loop.call_at(self.deadline, self._time_up, self.seq)
+
+    def _time_up(self, seq):
+        self.timer_handle = None
+        self.deadline = None
+        if seq == self.seq:
+            self.broadcast({"type": "time_up", "seq": seq, "stage": self.engine.stage})
+
+    # Connections
+
+    async def handle(self, reader, writer):
+        try:
+            method, target, headers = await read_http_head(reader)
+            url = urlsplit(target)
+            query = parse_qs(url.query)
+            if method != "GET":
+                await self.respond(writer, 405, "text/plain", b"Method Not Allowed")
+            elif url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                token = query.get("token", [""])[0]
+                coach = secrets.compare_digest(token.encode("utf-8"), self.coach_token.encode("utf-8"))
+                await self.websocket(reader, writer, headers, coach)
+            elif url.path == "/state":
+                body = json.dumps(self.state()).encode("utf-8")
+                await self.respond(writer, 200, "application/json", body)
+            elif url.path == "/":
+                await self.respond(writer, 200, "text/html; charset=utf-8", CLIENT_PAGE.encode("utf-8"))
+            else:
+                await self.respond(writer, 404, "text/plain", b"Not Found")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, content_type, body):
+        reason = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nCache-Control: no-store\r\nConnection: close\r\n\r\n".encode("latin-1")
+            + body
+        )
+        await writer.drain()
+
+    async def websocket(self, reader, writer, headers, coach):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            raise ValueError("missing Sec-WebSocket-Key")
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {ws_accept_key(key)}\r\n\r\n".encode("latin-1")
+        )
+        self.clients.add(writer)
+        hello = dict(self.state(), type="hello", coach=coach)
+        self.send_frame(writer, encode_frame(json.dumps(hello, separators=(",", ":"))))
+        try:
+            while True:
+                try:
+                    opcode, payload = await read_frame(reader, require_mask=True)
+                except FrameError as exc:
+                    writer.write(encode_frame(exc.code.to_bytes(2, "big") + str(exc).encode("utf-8"), OP_CLOSE))
+                    await writer.drain()
+                    break
+                if opcode == OP_CLOSE:
+                    writer.write(encode_frame(payload[:2], OP_CLOSE))
+                    break
+                if opcode == OP_PING:
+                    writer.write(encode_frame(payload, OP_PONG))
+                elif opcode == OP_TEXT and coach:
+                    try:
+                        message = json.loads(payload)
+                    except ValueError:
+                        continue
+                    if not isinstance(message, dict):
+                        continue
+                    try:
+                        await self.apply(message.get("action"), message)
+                    except ValueError as exc:
+                        # e.g. no flop matches the texture filter; tell the coach, keep the socket.
+                        error = {"type": "error", "action": message.get("action"), "message": str(exc)}
+                        self.send_frame(writer, encode_frame(json.dumps(error, separators=(",", ":"))))
+        finally:
+            self.clients.discard(writer)
+
+
+async def serve(host, port, room, ready=None):
+    """Run the server until cancelled; `ready` (a Future) gets the bound port."""
+    await room.pool.fill()
+    server = await asyncio.start_server(room.handle, host, port)
+    bound = server.sockets[0].getsockname()[1]
+    if ready is not None:
+        ready.set_result(bound)
+    async with server:
+        await server.serve_forever()
+
+
+# ----------------------- Client page -----------------------
+
+CLIENT_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>RTP Drillz Group</title>
+<style>
+body { background: #1a1a1a; color: #e0e0e0; font-family: Helvetica, Arial, sans-serif; text-align: center; }
+h1 { color: #ff9500; }
+.cards { margin: 18px 0; min-height: 88px; }
+.card { display: inline-block; width: 56px; height: 80px; line-height: 80px; margin: 0 4px; border-radius: 6px;
+        background: #fff; color: #111; font-size: 26px; font-weight: bold; }
+.card.red { color: #c00; }
+#felt { background: #004d00; border-radius: 16px; padding: 12px; max-width: 560px; margin: 0 auto; }
+#felt.flash { background: #ff3300; }
+#timer { font-size: 22px; margin: 10px; }
+#coach button { background: #ff9500; border: 0; border-radius: 6px; padding: 10px 14px; margin: 4px; font-size: 15px; }
+#coach button:disabled { background: #555; color: #999; }
+</style></head>
+<body>
+<h1>RTP Drillz</h1>
+<div id="felt"><div id="board" class="cards"></div><div id="timer">Time left: --:--</div>
+<div id="hand" class="cards"></div></div>
+<p id="status">Connecting...</p>
+<div id="coach" hidden>
+  <button data-a="deal">Deal Hand</button><button data-a="keep_hand">Keep Hand</button>
+  <button data-a="new_flop">New Flop</button><button data-a="keep_flop">Keep Flop</button>
+  <button data-a="new_turn">New Turn</button><button data-a="keep_turn">Keep Turn</button>
+  <button data-a="new_river">New River</button><button data-a="keep_river">Keep River</button>
+  <label>Timer <select id="secs"><option>0</option><option>10</option><option>15</option><option>30</option>
+  <option>45</option><option>60</option><option>90</option></select> s</label>
+</div>
+<script>
+const SUITS = { s: "\\u2660", h: "\\u2665", d: "\\u2666", c: "\\u2663" };
+const token = new URLSearchParams(location.search).get("coach") || "";
+let ws, deadline = null;
+function renderCards(el, cards) {
+  el.replaceChildren(...cards.map((c) => {
+    const d = document.createElement("span");
+    d.className = "card" + ("hd".includes(c[1]) ? " red" : "");
+    d.textContent = c[0] + SUITS[c[1]];
+    return d;
+  }));
+}
+function tick() {
+  const el = document.getElementById("timer");
+  if (deadline === null) { el.textContent = "Time left: --:--"; return; }
+  const s = Math.max(0, Math.ceil((deadline - performance.now()) / 1000));
+  el.textContent = "Time left: " + Math.floor(s / 60) + ":" + String(s % 60).padStart(2, "0");
+}
+function onMessage(event) {
+  const m = JSON.parse(event.data);
+  if (m.type === "error") { document.getElementById("status").textContent = "Error: " + m.message; return; }
+  if (m.type === "time_up") { deadline = null; tick(); document.getElementById("felt").classList.add("flash"); return; }
+  document.getElementById("felt").classList.remove("flash");
+  if (m.type === "hello") {
+    document.getElementById("coach").hidden = !m.coach;
+    document.getElementById("secs").value = String(m.timer_seconds);
+  }
+  document.querySelectorAll("#coach button").forEach((b) => { b.disabled = !m.actions.includes(b.dataset.a); });
+  renderCards(document.getElementById("hand"), m.hand);
+  renderCards(document.getElementById("board"), m.board);
+  deadline = m.remaining_ms === null ? null : performance.now() + m.remaining_ms;
+  document.getElementById("status").textContent = m.stage.toUpperCase() + " \\u00b7 " + m.clients + " connected";
+  tick();
+}
+function connect() {
+  ws = new WebSocket((location.protocol === "https:" ? "wss://" : "ws://") + location.host + "/ws?token=" + encodeURIComponent(token));
+  ws.onmessage = onMessage;
+  ws.onclose = () => { document.getElementById("status").textContent = "Reconnecting..."; setTimeout(connect, 1000); };
+}
+document.querySelectorAll("#coach button").forEach((b) => {
+  b.onclick = () => ws.send(JSON.stringify({ action: b.dataset.a }));
+});
+document.getElementById("secs").onchange = (e) => ws.send(JSON.stringify({ action: "timer", seconds: Number(e.target.value) }));
+setInterval(tick, 200);
+connect();
+</script>
+</body></html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an RTP Drillz group study server.")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (0.0.0.0 to serve the LAN).")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port.")
+    parser.add_argument("--timer", type=int, default=0, help="Seconds per street (0 = no timer).")
+    parser.add_argument("--range", default=PLAYABLE_RANGE, help='Hero range, e.g. "TT+, AQs+, AKo".')
+    parser.add_argument("--flop-texture", action="append", choices=TEXTURES, default=[], help="Only deal flops with this texture.")
+    parser.add_argument("--iso-flops", action="store_true", help="Deal flops uniformly over suit-isomorphism classes.")
+    parser.add_argument("--coach-token", help="Token that unlocks coach controls (random if omitted).")
+    args = parser.parse_args()
+
+    try:
+        if not compile_range(args.range).combos:
+            print("ERROR: --range contains no hands", file=sys.stderr)
+            return 1
+        if args.flop_texture:
+            matching_flops(tuple(args.flop_texture))
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    pool = SpotPool(args.range, tuple(args.flop_texture), args.iso_flops)
+    room = DrillRoom(pool, timer_seconds=args.timer, coach_token=args.coach_token)
+    print(f"Players: http://{args.host}:{args.port}/")
+    print(f"Coach:   http://{args.host}:{args.port}/?coach={room.coach_token}")
+    try:
+        asyncio.run(serve(args.host, args.port, room))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
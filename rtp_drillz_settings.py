@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Settings store for the RTP Drillz desktop app (JSON).
+
+Holds the timer choice, flop texture (spot tag) filter, hero range and
+window geometry in rtp_settings.json:
+
+  settings = SettingsStore("rtp_settings.json", legacy_path="rtp_config.txt")
+  settings.get("timer")
+  settings.update(timer="30s")      # returns at once
+  settings.close()                  # writes anything still pending
+
+update() only changes the in-memory values. A writer thread waits until
+no update has arrived for `delay` seconds (or `max_delay` since the first
+unsaved change), then writes the whole file once: to a temp file in the
+same folder, then os.replace() over the old one, so a crash mid-write
+never leaves a truncated file. A burst of menu clicks or window drags
+costs one write.
+
+The old rtp_config.txt (timer choice only) is read once when no JSON
+file exists yet.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+DEFAULTS = {
+    "timer": "None",
+    "flop_texture": "Any",
+    "range": "Playable",
+    "geometry": "1000x800",
+}
+
+WRITE_DELAY_S = 0.5
+MAX_WRITE_DELAY_S = 2.0
+
+
+def read_settings(path, legacy_path=None):
+    """DEFAULTS overlaid with the saved values; unknown keys and bad types are dropped."""
+    values = dict(DEFAULTS)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except FileNotFoundError:
+        saved = {}
+        if legacy_path is not None:
+            try:
+                with open(legacy_path, "r", encoding="utf-8") as f:
+                    saved = {"timer": f.read().strip()}
+            except OSError:
+                pass
+    except (OSError, ValueError):
+        saved = {}
+    if isinstance(saved, dict):
+        for key, value in saved.items():
+            if key in DEFAULTS and isinstance(value, type(DEFAULTS[key])):
+                values[key] = value
+    return values
+
+
+def write_settings(path, values):
+    """Atomically replace `path` with `values` as JSON."""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".rtp_settings.", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(values, f, indent=2, sort_keys=True)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class SettingsStore:
+    """In-memory settings with debounced atomic writes on a background thread."""
+
+    def __init__(self, path, legacy_path=None, delay=WRITE_DELAY_S, max_delay=MAX_WRITE_DELAY_S):
+        self.path = path
+        self.delay = delay
+        self.max_delay = max_delay
+        self.values = read_settings(path, legacy_path)
+        self.writes = 0
+        self._cond = threading.Condition()
+        self._changed = 0          # bumped by every update() that changes a value
+        self._saved = 0            # value of _changed last written to disk
+        self._dirty_since = None   # monotonic time of the first unsaved change
+        self._last_change = None
+        self._flush_now = False
+        self._closing = False
+        self._writer = threading.Thread(target=self._write_loop, name="rtp-settings-writer", daemon=True)
+        self._writer.start()
+
+    def get(self, key):
+        return self.values[key]
+
+    def update(self, **changes):
+        """Change settings in memory and schedule a write; never blocks on disk."""
+        with self._cond:
+            changed = {k: v for k, v in changes.items() if self.values.get(k) != v}
+            if not changed:
+                return
+            self.values = {**self.values, **changed}
+            self._changed += 1
+            now = time.monotonic()
+            self._last_change = now
+            if self._dirty_since is None:
+                self._dirty_since = now
+            self._cond.notify_all()
+
+    def flush(self):
+        """Block until the current values are on disk (or the write failed)."""
+        with self._cond:
+            target = self._changed
+            self._flush_now = True
+            self._cond.notify_all()
+            while self._saved < target and self._writer.is_alive():
+                self._cond.wait(0.1)
+
+    def close(self):
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._writer.join()
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._dirty_since is None:
+                        self._flush_now = False
+                        if self._closing:
+                            return
+                        self._cond.wait()
+                        continue
+                    now = time.monotonic()
+                    due = min(self._last_change + self.delay, self._dirty_since + self.max_delay)
+                    if self._closing or self._flush_now or now >= due:
+                        break
+                    self._cond.wait(due - now)
+                values, generation = self.values, self._changed
+                self._dirty_since = self._last_change = None
+
+            try:
+                write_settings(self.path, values)
+                self.writes += 1
+            except OSError as exc:
+                print(f"WARNING: could not save settings: {exc}", file=sys.stderr)
+
+            with self._cond:
+                # A failed write still counts, so flush() never waits forever.
+                self._saved = generation
+                self._cond.notify_all()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Flop texture table for RTP Drillz.
+
+Every one of the 22,100 flops is classified once into a bit set of
+textures and kept in compact arrays. Filtered dealing then draws straight
+from the matching subset instead of rerolling:
+
+  flops = matching_flops(("two-tone", "connected"))
+  c1, c2, c3 = flop_cards(random.choice(flops))
+  c1, c2, c3 = flop_cards(random_matching_flop(rng, ("two-tone",), hero=(51, 47)))
+
+Cards are ints 0-51 as in rtp_drillz_deck. Texture filters are ANDed.
+"""
+
+from array import array
+from functools import lru_cache
+
+
+TEXTURES = (
+    "monotone",
+    "two-tone",
+    "rainbow",
+    "paired",
+    "trips",
+    "connected",
+    "broadway",
+    "low",
+    "a-high-dry",
+)
+TEXTURE_BITS = {name: 1 << i for i, name in enumerate(TEXTURES)}
+
+ACE = 12
+TEN = 8
+EIGHT = 6
+
+
+def classify_flop(c1, c2, c3):
+    """Return the texture bit set for three card ints."""
+    ranks = sorted((c1 >> 2, c2 >> 2, c3 >> 2), reverse=True)
+    suit_count = len({c1 & 3, c2 & 3, c3 & 3})
+    distinct = len(set(ranks))
+
+    bits = 0
+    if suit_count == 1:
+        bits |= TEXTURE_BITS["monotone"]
+    elif suit_count == 2:
+        bits |= TEXTURE_BITS["two-tone"]
+    else:
+        bits |= TEXTURE_BITS["rainbow"]
+
+    if distinct == 1:
+        bits |= TEXTURE_BITS["trips"]
+    elif distinct == 2:
+        bits |= TEXTURE_BITS["paired"]
+    else:
+        high, _, low = ranks
+        # Three distinct ranks inside one five-rank straight window.
+        wheel = high == ACE and ranks[1] <= 3
+        if high - low <= 4 or wheel:
+            bits |= TEXTURE_BITS["connected"]
+
+    if ranks[-1] >= TEN:
+        bits |= TEXTURE_BITS["broadway"]
+    if ranks[0] <= EIGHT:
+        bits |= TEXTURE_BITS["low"]
+
+    dry = TEXTURE_BITS["rainbow"] | TEXTURE_BITS["connected"] | TEXTURE_BITS["paired"] | TEXTURE_BITS["trips"]
+    if ranks[0] == ACE and bits & dry == TEXTURE_BITS["rainbow"]:
+        bits |= TEXTURE_BITS["a-high-dry"]
+    return bits
+
+
+def flop_texture_names(c1, c2, c3):
+    bits = classify_flop(c1, c2, c3)
+    return [name for name in TEXTURES if bits & TEXTURE_BITS[name]]
+
+
+@lru_cache(maxsize=None)
+def flop_table():
+    """
+    (flops, textures): flops[i] packs the three cards of flop i as
+    c1 | c2 << 6 | c3 << 12 with c1 < c2 < c3; textures[i] is its bit set.
+    """
+    flops = array("I")
+    textures = array("H")
+    for a in range(52):
+        for b in range(a + 1, 52):
+            for c in range(b + 1, 52):
+                flops.append(a | b << 6 | c << 12)
+                textures.append(classify_flop(a, b, c))
+    return flops, textures
+
+
+def flop_cards(packed):
+    return packed & 63, packed >> 6 & 63, packed >> 12
+
+
+def texture_mask(names):
+    mask = 0
+    for name in names:
+        if name not in TEXTURE_BITS:
+            raise ValueError(f"Unknown flop texture: {name!r}")
+        mask |= TEXTURE_BITS[name]
+    return mask
+
+
+# Redraws before random_matching_flop() gives up and filters the subset.
+MAX_REDRAWS = 64
+
+
+def flop_blocked(packed, dead):
+    """True if the packed flop uses a card set in the `dead` bit mask."""
+    return dead >> (packed & 63) & 1 or dead >> (packed >> 6 & 63) & 1 or dead >> (packed >> 12) & 1
+
+
+@lru_cache(maxsize=None)
+def _texture_subset(mask):
+    flops, textures = flop_table()
+    return array("I", (packed for packed, bits in zip(flops, textures) if bits & mask == mask))
+
+
+def matching_flops(names):
+    """Packed flops having every texture in `names`; built once per texture set."""
+    flops = _texture_subset(texture_mask(names))
+    if not flops:
+        raise ValueError(f"No flops match textures {', '.join(names)}.")
+    return flops
+
+
+def random_matching_flop(rng, names=(), hero=()):
+    """
+    A packed flop drawn uniformly from those having every texture in
+    `names` and no card in `hero`. Draws from the shared texture subset and
+    redraws when a hero card collides, so a draw is O(1) expected.
+    """
+    flops = matching_flops(names)
+    dead = 0
+    for card in hero:
+        dead |= 1 << card
+    for _ in range(MAX_REDRAWS):
+        packed = rng.choice(flops)
+        if not flop_blocked(packed, dead):
+            return packed
+    # The hero blocks most of a tiny subset; filter it once.
+    live = [packed for packed in flops if not flop_blocked(packed, dead)]
+    if not live:
+        raise ValueError(f"No flops match textures {', '.join(names)} with those hero cards.")
+    return rng.choice(live)